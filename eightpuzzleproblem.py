@@ -1,31 +1,251 @@
+from array import array
 from collections import deque
+from contextlib import nullcontext
 import heapq
+import json
+import mmap
+import os
+import struct
+import sys
 import time
 
+#a board is packed into a single int, one fixed width field per cell, cell (i, j) lives at
+#bit TILE_BITS * (size * i + j). The constants below are for the 3x3 board, the default;
+#every other width gets the same tables from board_geometry()
+SIZE = 3
+TILE_BITS = 4
+TILE_MASK = (1 << TILE_BITS) - 1
+
+def _tile_bits(size):
+    #4 bits hold tiles up to 15, bigger boards need 5
+    return 4 if size * size <= 16 else 5
+
+def pack_board(board):
+    """Packs a list of lists board into a single int (4 bits per tile, 5 from 5x5 up).
+
+    Args:
+        board (_type_): NxN list of lists
+
+    Returns:
+        _type_: the packed board
+    """
+    tile_bits = _tile_bits(len(board))
+    code = 0
+    for index, tile in enumerate(tile for row in board for tile in row):
+        code |= tile << (tile_bits * index)
+    return code
+
+def unpack_board(code, size=SIZE):
+    """Unpacks an int made by pack_board() back into a list of lists.
+
+    Args:
+        code (_type_): the packed board
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: NxN list of lists
+    """
+    tile_bits = _tile_bits(size)
+    tile_mask = (1 << tile_bits) - 1
+    return [[(code >> (tile_bits * (size * i + j))) & tile_mask for j in range(size)] for i in range(size)]
+
+def goal_board(size=SIZE):
+    #tiles 1 to size * size - 1 in order with the empty tile in the bottom right corner
+    return [[(size * i + j + 1) % (size * size) for j in range(size)] for i in range(size)]
+
+GOAL_CODE = pack_board(goal_board())
+
+#a move is stored as a 2-bit code for the direction the empty tile slides:
+#0 up, 1 down, 2 left, 3 right. move ^ 1 is the move that undoes it
+MOVE_OFFSETS = (-SIZE, SIZE, -1, 1)
+MOVE_NAMES = "UDLR"
+
+#for each position of the empty tile, the (position, move) pairs it can slide to
+#kept in the same up, down, left, right order the search algorithms have always expanded in
+def _neighbor_moves(size=SIZE):
+    table = []
+    for index in range(size * size):
+        x, y = divmod(index, size)
+        table.append(tuple(
+            (size * (x + dx) + y + dy, move)
+            for move, (dx, dy) in enumerate([(-1, 0), (1, 0), (0, -1), (0, 1)])
+            if 0 <= x + dx < size and 0 <= y + dy < size
+        ))
+    return tuple(table)
+
+NEIGHBOR_MOVES = _neighbor_moves()
+NEIGHBOR_INDICES = tuple(tuple(target for target, _ in moves) for moves in NEIGHBOR_MOVES)
+
+def manhattan_table(target_code, size=SIZE):
+    """Precomputes the manhattan distance of every tile from every cell to where
+    that tile sits on the target board. table[tile][index] is looked up instead of
+    recomputing coordinates for every state.
+
+    Args:
+        target_code (_type_): packed board the distances are measured to
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: tuple indexed by [tile][cell index], the empty tile always costs 0
+    """
+    tile_bits = _tile_bits(size)
+    target_index = {}
+    for index in range(size * size):
+        target_index[(target_code >> (tile_bits * index)) & ((1 << tile_bits) - 1)] = index
+    table = []
+    for tile in range(size * size):
+        goal_x, goal_y = divmod(target_index[tile], size)
+        table.append(tuple(
+            0 if tile == 0 else abs(goal_x - index // size) + abs(goal_y - index % size)
+            for index in range(size * size)
+        ))
+    return tuple(table)
+
+GOAL_MANHATTAN = manhattan_table(GOAL_CODE)
+
+def manhattan_distance(code, table=GOAL_MANHATTAN):
+    """Full manhattan distance of a packed board, one table lookup per cell.
+
+    Args:
+        code (_type_): the packed board
+        table (_type_, optional): a manhattan_table(), its size gives the board's. Defaults to the 3x3 goal board's table.
+
+    Returns:
+        _type_: sum of the manhattan distances of every tile
+    """
+    tile_bits = TILE_BITS if len(table) <= 16 else 5
+    tile_mask = (1 << tile_bits) - 1
+    cost = 0
+    for index in range(len(table)):
+        cost += table[(code >> (tile_bits * index)) & tile_mask][index]
+    return cost
+
+class BoardGeometry:
+    __slots__ = ("size", "cells", "tile_bits", "tile_mask", "goal_code", "move_offsets",
+                 "neighbor_moves", "neighbor_indices", "manhattan")
+
+    def __init__(self, size):
+        """The tables the solvers need for one board width, built once by board_geometry()
+        and shared by every state of that width.
+
+        Args:
+            size (_type_): width of the board, 3 for the 8-puzzle, 4 for the 15-puzzle, 5 for the 24-puzzle
+        """
+        self.size = size
+        self.cells = size * size
+        self.tile_bits = _tile_bits(size)
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.goal_code = pack_board(goal_board(size))
+        self.move_offsets = (-size, size, -1, 1)
+        self.neighbor_moves = _neighbor_moves(size)
+        self.neighbor_indices = tuple(tuple(target for target, _ in moves) for moves in self.neighbor_moves)
+        self.manhattan = manhattan_table(self.goal_code, size)
+
+_geometries = {}
+
+def board_geometry(size=SIZE):
+    """The shared BoardGeometry of a board width.
+
+    Args:
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: BoardGeometry
+    """
+    if size not in _geometries:
+        if not 2 <= size <= 5:
+            raise ValueError(f"board width must be between 2 and 5, not {size}")
+        _geometries[size] = BoardGeometry(size)
+    return _geometries[size]
+
 class PuzzleState:
-    def __init__(self, board, empty_tile, depth=0, parent=None):
+    __slots__ = ("code", "empty_index", "depth", "moves", "h", "geometry")
+
+    def __init__(self, board, empty_tile, depth=0, moves=0, h=None, size=None):
         """Initializes the board of the 8-puzzle problem.
 
 
         Args:
-            board (_type_): the boards current state
-            empty_tile (_type_): The position of the empty tile '0'
+            board (_type_): the boards current state, either a list of lists or a packed int
+            empty_tile (_type_): The position of the empty tile '0', as (row, column) or as a flat index
             depth (int, optional): The current depth of the boards state Defaults to 0.
-            parent (_type_, optional): _description_. Defaults to None.
+            moves (int, optional): the path from the start board, 2 bits per move with the last move
+                in the lowest bits. Defaults to 0.
+            h (_type_, optional): manhattan distance to the goal if the caller already knows it. Defaults to None (computed here).
+            size (_type_, optional): width of the board, or its BoardGeometry. Defaults to the width of a
+                list of lists board, SIZE for a packed one.
         """
-        self.board = board
-        self.empty_tile = empty_tile
+        if size.__class__ is BoardGeometry:
+            geometry = size
+        else:
+            geometry = board_geometry(size or (SIZE if isinstance(board, int) else len(board)))
+        self.geometry = geometry
+        self.code = board if isinstance(board, int) else pack_board(board)
+        self.empty_index = empty_tile if isinstance(empty_tile, int) else geometry.size * empty_tile[0] + empty_tile[1]
         self.depth = depth
-        self.parent = parent
+        #no reference to the parent state is kept, so expanded states can be freed during a search
+        self.moves = moves
+        #h(n) is kept up to date by get_neighbors(), only a state built from scratch needs the full scan
+        self.h = manhattan_distance(self.code, geometry.manhattan) if h is None else h
+
+    @property
+    def size(self):
+        return self.geometry.size
+
+    @property
+    def board(self):
+        return unpack_board(self.code, self.geometry.size)
+
+    @property
+    def empty_tile(self):
+        return divmod(self.empty_index, self.geometry.size)
+
+    @property
+    def g(self):
+        return self.depth
+
+    @property
+    def parent(self):
+        """The state before the last move, decoded from the move codes by sliding
+        the tile back. None for the start board.
+        """
+        if self.depth == 0:
+            return None
+        geometry = self.geometry
+        empty_index = self.empty_index
+        #the empty tile came from here, and the tile that moved is now there
+        previous = empty_index - geometry.move_offsets[self.moves & 3]
+        tile = (self.code >> (geometry.tile_bits * previous)) & geometry.tile_mask
+        code = self.code - (tile << (geometry.tile_bits * previous)) + (tile << (geometry.tile_bits * empty_index))
+        h = self.h - geometry.manhattan[tile][previous] + geometry.manhattan[tile][empty_index]
+        return PuzzleState(code, previous, self.depth - 1, self.moves >> 2, h, geometry)
+
+    def slide(self, move):
+        """The state after sliding the empty tile in one direction (0 up, 1 down, 2 left, 3 right).
+        The move has to stay on the board.
+
+        Args:
+            move (_type_): 2-bit move code
+
+        Returns:
+            _type_: the child state
+        """
+        geometry = self.geometry
+        empty_index = self.empty_index
+        target = empty_index + geometry.move_offsets[move]
+        tile = (self.code >> (geometry.tile_bits * target)) & geometry.tile_mask
+        code = self.code - (tile << (geometry.tile_bits * target)) + (tile << (geometry.tile_bits * empty_index))
+        h = self.h - geometry.manhattan[tile][target] + geometry.manhattan[tile][empty_index]
+        return PuzzleState(code, target, self.depth + 1, (self.moves << 2) | move, h, geometry)
 
     def __lt__(self, other):
         return self.depth < other.depth
 
     def __eq__(self, other):
-        return self.board == other.board
+        return self.code == other.code
 
     def __hash__(self):
-        return hash(str(self.board))
+        return self.code
 
 
     def get_neighbors(self):
@@ -40,79 +260,218 @@ class PuzzleState:
         """
         #a list to store neighboring states
         neighbors = []
-        #coordinates of empty tile
-        x, y = self.empty_tile
-        #possible actions to take
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        #iterating over each possible direction available above
-        for dx, dy in directions:
-            #nx,ny represent the new coordinates of the empty space after moving
-            nx, ny = x + dx, y + dy
-            #if the new location of the empty tile is in a valid position
-            if 0 <= nx < 3 and 0 <= ny < 3:
-                #new board initialiazation process
-                new_board = [row[:] for row in self.board]
-                #swap the location of the empty tile and the tile it moved to
-                new_board[x][y], new_board[nx][ny] = new_board[nx][ny], new_board[x][y]
-                #adds the new state to the list of neighbors and is linked to its parent state
-                neighbors.append(PuzzleState(new_board, (nx, ny), self.depth + 1, self))
+        geometry = self.geometry
+        tile_bits = geometry.tile_bits
+        manhattan = geometry.manhattan
+        code = self.code
+        empty_index = self.empty_index
+        #bit offset of the empty tile
+        empty_shift = tile_bits * empty_index
+        moves = self.moves << 2
+        #iterating over each position the empty tile can move to
+        for target, move in geometry.neighbor_moves[empty_index]:
+            target_shift = tile_bits * target
+            #the tile that slides into the empty space
+            tile = (code >> target_shift) & geometry.tile_mask
+            #clear the tile from its old cell and write it into the old empty cell
+            new_code = code - (tile << target_shift) + (tile << empty_shift)
+            #only the moved tile changes its distance to the goal
+            new_h = self.h - manhattan[tile][target] + manhattan[tile][empty_index]
+            #adds the new state to the list of neighbors, carrying the path so far plus this move
+            neighbors.append(PuzzleState(new_code, target, self.depth + 1, moves | move, new_h, geometry))
         #returns list of neighbors of the puzzle
         return neighbors
 
     def is_goal(self):
-        return self.board == [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+        return self.code == self.geometry.goal_code
 
-    def get_path(self):
-        path = []
+    def iter_path(self):
+        """Decodes the move codes into the states from the start board to this one,
+        one at a time. The start board is found by undoing every move first.
+
+        Yields:
+            _type_: each state on the path, in order
+        """
         state = self
-        while state:
-            path.append(state)
+        while state.depth:
             state = state.parent
-        return path[::-1]
+        yield state
+        for step in range(self.depth - 1, -1, -1):
+            state = state.slide((self.moves >> (2 * step)) & 3)
+            yield state
+
+    def get_path(self):
+        return list(self.iter_path())
+
+    def get_moves(self):
+        """The path from the start board as a string of the directions the empty
+        tile moved in, e.g. "ULLD".
+        """
+        return ''.join(MOVE_NAMES[(self.moves >> (2 * step)) & 3] for step in range(self.depth - 1, -1, -1))
 
 def print_board(state):
     for row in state.board:
         print(row)
     print()
 
-initial_board = [[1, 2, 3], [4, 0, 5], [6, 7, 8]]
-initial_board2 = [[1, 2, 3], [4, 0, 5], [6, 7, 8]]
-# MAX_ITERATION = 10000
+def state_from_board(board):
+    """Builds the starting PuzzleState for a list of lists board, finding the empty tile.
+
+    Args:
+        board (_type_): list of lists board
+
+    Returns:
+        _type_: PuzzleState at depth 0
+    """
+    empty_tile = [(i, j) for i in range(len(board)) for j in range(len(board)) if board[i][j] == 0][0]
+    return PuzzleState(board, empty_tile)
+
+def is_solvable(state):
+    """Checks whether the goal can be reached at all, in O(n^2) and without searching.
+    Every move keeps the parity of (inversions + row of the empty tile) on even width
+    boards, and of the inversions alone on odd width boards, so a board is solvable
+    exactly when that parity matches the goal's.
+
+    Every search rejects an unsolvable board up front and returns (None, 0), which
+    keeps it apart from (None, None) for running out of MAX_ITERATION.
+
+    Args:
+        state (_type_): PuzzleState or list of lists board
+
+    Returns:
+        _type_: True if the goal board can be reached
+    """
+    board = state.board if isinstance(state, PuzzleState) else state
+    width = len(board)
+    tiles = [tile for row in board for tile in row if tile != 0]
+    inversions = 0
+    for i in range(len(tiles)):
+        for j in range(i + 1, len(tiles)):
+            if tiles[i] > tiles[j]:
+                inversions += 1
+    if width % 2:
+        return inversions % 2 == 0
+    #rows counted from the bottom, the goal has its empty tile on row 1 and no inversions
+    empty_row = width - [i for i in range(width) if 0 in board[i]][0]
+    return (inversions + empty_row) % 2 == 1
+
+MAX_ITERATION = 10000
 
-empty_tile = (1, 1)
-initial_state = PuzzleState(initial_board, empty_tile)
-initial_state2 = PuzzleState(initial_board2, empty_tile)
-print_board(initial_state)
+class SearchStats:
+    def __init__(self, track_memory=False):
+        """Counters a solver fills in when it is passed stats=SearchStats(). Solvers only
+        touch it behind `if stats is not None`, so leaving it out costs nothing.
+        Use it as a context manager (solve() does) to also get the total time and,
+        with track_memory, the peak memory traced by tracemalloc.
+
+        Args:
+            track_memory (bool, optional): trace allocations for peak_memory, which slows the search down. Defaults to False.
+        """
+        self.track_memory = track_memory
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+        self.peak_explored = 0
+        self.peak_memory = 0
+        #seconds spent generating neighbors, computing heuristics and on the priority queue
+        self.expansion_time = 0.0
+        self.heuristic_time = 0.0
+        self.queue_time = 0.0
+        self.total_time = 0.0
+        #expansions per f value for informed searches, per depth for uninformed ones
+        self.layers = {}
+        self._started_tracing = False
+
+    def expand(self, layer, frontier_size, explored_size):
+        self.expanded += 1
+        self.layers[layer] = self.layers.get(layer, 0) + 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if explored_size > self.peak_explored:
+            self.peak_explored = explored_size
+
+    def __enter__(self):
+        if self.track_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        self._start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total_time += time.perf_counter() - self._start_time
+        if self.track_memory:
+            import tracemalloc
+
+            self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def as_dict(self):
+        return {
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'peak_frontier': self.peak_frontier,
+            'peak_explored': self.peak_explored,
+            'peak_memory': self.peak_memory,
+            'expansion_time': self.expansion_time,
+            'heuristic_time': self.heuristic_time,
+            'queue_time': self.queue_time,
+            'total_time': self.total_time,
+            'layers': dict(sorted(self.layers.items())),
+        }
 
 
 ###########################################################
 ###   BFS IMPLEMENTATION   ################################
 ###########################################################
-def bfs(initial_state):
+def bfs(initial_state, bidirectional=False, stats=None):
     """Breadth First Search Algoritm looks at all neighbors 
     of current depth level before moving on to the next
 
     Args:
         initial_state (_type_): Takes the intial state of the board as a parameter
+        bidirectional (bool, optional): search from the goal at the same time, see bidirectional_bfs(). Defaults to False.
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
 
     Returns:
         _type_: None
     """
+    if bidirectional:
+        return bidirectional_bfs(initial_state, stats)
+    if not is_solvable(initial_state):
+        return None, 0
     frontier = deque([initial_state])
-    explored = set()
+    #every state that has ever been put on the frontier (explored states plus the frontier itself)
+    #a state only leaves the frontier by being explored, so this answers both membership checks in O(1)
+    seen = {initial_state}
     iterations = 0
     while frontier and iterations <= MAX_ITERATION:
         state = frontier.popleft()
         #check if current state is equal to goal state
         if state.is_goal():
-            #get all parents of goal state
+            #decode the goal state's moves into its path
             return state.get_path(), iterations
-        #state was not goal state, add state to explored set
-        explored.add(state)
+        if stats is not None:
+            stats.expand(state.depth, len(frontier), len(seen) - len(frontier))
+            start_time = time.perf_counter()
+        neighbors = state.get_neighbors()
+        if stats is not None:
+            stats.expansion_time += time.perf_counter() - start_time
+            stats.generated += len(neighbors)
         #move on to next neighbor in current depth
-        for neighbor in state.get_neighbors():
-            if neighbor not in explored and neighbor not in frontier:
+        for neighbor in neighbors:
+            if neighbor not in seen:
+                seen.add(neighbor)
                 frontier.append(neighbor)
+            elif stats is not None:
+                stats.duplicates += 1
         iterations+=1
     return None, None
 
@@ -130,6 +489,231 @@ def bfs(initial_state):
 #     print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
 
 
+###########################################################
+###   EXTERNAL MEMORY BFS   ###############################
+###########################################################
+
+# Breadth first search that keeps its layers on disk instead of in a `seen` set, for state
+# spaces whose explored set does not fit in memory. Every layer is a file of sorted packed
+# codes. The next layer is generated in sorted runs of at most run_size codes, the runs are
+# merged, and duplicates are dropped by merging against the previous two layers: the
+# neighbours of a layer can only lie in the layer before it, itself or the next one.
+# Memory stays at about one run plus a read buffer per open file whatever the layer sizes.
+
+LAYER_BUFFER = 1 << 16
+
+def _read_codes(path):
+    #stream the codes of a layer or run file a buffer at a time
+    with open(path, "rb") as file:
+        while True:
+            codes = array("Q")
+            try:
+                codes.fromfile(file, LAYER_BUFFER)
+            except EOFError:
+                yield from codes
+                return
+            yield from codes
+
+def _write_codes(path, codes):
+    #write sorted codes a buffer at a time, returns how many were written
+    count = 0
+    with open(path, "wb") as file:
+        buffer = array("Q")
+        for code in codes:
+            buffer.append(code)
+            if len(buffer) == LAYER_BUFFER:
+                buffer.tofile(file)
+                count += len(buffer)
+                buffer = array("Q")
+        buffer.tofile(file)
+        count += len(buffer)
+    return count
+
+def _unique_except(codes, excluded):
+    #drop repeats from a sorted stream, and anything also in the sorted stream `excluded`
+    excluded = iter(excluded)
+    skip = next(excluded, None)
+    last = None
+    for code in codes:
+        if code == last:
+            continue
+        last = code
+        while skip is not None and skip < code:
+            skip = next(excluded, None)
+        if skip != code:
+            yield code
+
+def _code_neighbors(code, geometry):
+    #codes of the boards one move away, found straight from the packed code
+    tile_bits = geometry.tile_bits
+    empty_index = 0
+    while (code >> (tile_bits * empty_index)) & geometry.tile_mask:
+        empty_index += 1
+    for target in geometry.neighbor_indices[empty_index]:
+        tile = (code >> (tile_bits * target)) & geometry.tile_mask
+        yield code - (tile << (tile_bits * target)) + (tile << (tile_bits * empty_index))
+
+def layer_contains(path, code):
+    """Binary search of a sorted layer file, without reading it into memory.
+
+    Args:
+        path (_type_): layer file written by external_bfs()
+        code (_type_): packed board
+
+    Returns:
+        _type_: True if the board is in the layer
+    """
+    from bisect import bisect_left
+
+    if not os.path.getsize(path):
+        return False
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        codes = memoryview(mapped).cast("Q")
+        try:
+            index = bisect_left(codes, code)
+            return index < len(codes) and codes[index] == code
+        finally:
+            codes.release()
+
+def external_layers(initial_code, directory, run_size=1 << 20, keep_layers=True, size=SIZE):
+    """Generates the BFS layers around a board as sorted files in directory.
+
+    Args:
+        initial_code (_type_): packed board the layers are counted from
+        directory (_type_): where the layer and run files go
+        run_size (int, optional): most codes held in memory while generating a layer. Defaults to 1 << 20.
+        keep_layers (bool, optional): keep every layer file, not only the last three. Defaults to True.
+        size (_type_, optional): width of the board, up to 4 so a board fits the 64-bit codes of the files. Defaults to SIZE.
+
+    Yields:
+        _type_: (depth, layer file, number of boards in it) for every layer, starting at depth 0
+    """
+    geometry = board_geometry(size)
+    if geometry.tile_bits * geometry.cells > 64:
+        raise ValueError(f"a {size}x{size} board does not fit the 64-bit codes of the layer files")
+
+    def layer_path(depth):
+        return os.path.join(directory, f"layer_{depth}.bin")
+
+    count = _write_codes(layer_path(0), [initial_code])
+    depth = 0
+    while count:
+        yield depth, layer_path(depth), count
+        #expand the layer into sorted runs
+        runs = []
+        buffer = []
+
+        def flush():
+            path = os.path.join(directory, f"run_{depth + 1}_{len(runs)}.bin")
+            buffer.sort()
+            _write_codes(path, buffer)
+            runs.append(path)
+            buffer.clear()
+
+        for code in _read_codes(layer_path(depth)):
+            buffer.extend(_code_neighbors(code, geometry))
+            if len(buffer) >= run_size:
+                flush()
+        if buffer:
+            flush()
+        previous = [layer_path(depth)] + ([layer_path(depth - 1)] if depth else [])
+        candidates = heapq.merge(*(_read_codes(run) for run in runs))
+        excluded = heapq.merge(*(_read_codes(path) for path in previous))
+        count = _write_codes(layer_path(depth + 1), _unique_except(candidates, excluded))
+        for run in runs:
+            os.remove(run)
+        if not keep_layers and depth:
+            os.remove(layer_path(depth - 1))
+        depth += 1
+    os.remove(layer_path(depth))
+
+def external_bfs(initial_state, directory=None, run_size=1 << 20, report=None, stats=None):
+    """BFS with its layers on disk, see the notes above. Once the goal's layer is found the path
+    is rebuilt backwards by looking up a neighbour of each board in the layer before it.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        directory (_type_, optional): where the layer files go. Defaults to None (a temporary directory,
+            removed afterwards).
+        run_size (int, optional): most codes held in memory while generating a layer. Defaults to 1 << 20.
+        report (_type_, optional): dict filled in with the 'histogram', the number of boards at every depth. Defaults to None.
+        stats (_type_, optional): a SearchStats to record into, one expansion per layer, and the time spent
+            writing each layer as expansion_time. Defaults to None (no instrumentation).
+
+    Returns:
+        _type_: optimal path and number of boards expanded
+    """
+    import shutil
+    import tempfile
+
+    if not is_solvable(initial_state):
+        return None, 0
+    temporary = directory is None
+    if temporary:
+        directory = tempfile.mkdtemp(prefix="bfs_")
+    geometry = initial_state.geometry
+    histogram = []
+    layers = []
+    iterations = 0
+    try:
+        #the generator does the expanding, sorting and merging of a layer before it yields it
+        start_time = time.perf_counter()
+        for depth, path, count in external_layers(initial_state.code, directory, run_size, size=geometry.size):
+            histogram.append(count)
+            layers.append(path)
+            if stats is not None:
+                stats.expansion_time += time.perf_counter() - start_time
+                stats.expand(depth, count, iterations)
+            if layer_contains(path, geometry.goal_code):
+                break
+            iterations += count
+            start_time = time.perf_counter()
+        else:
+            return None, None
+        #walk back from the goal, one layer at a time
+        codes = [geometry.goal_code]
+        for path in reversed(layers[:-1]):
+            codes.append(next(code for code in _code_neighbors(codes[-1], geometry) if layer_contains(path, code)))
+        state = initial_state
+        path = [state]
+        for code in reversed(codes[:-1]):
+            state = next(neighbor for neighbor in state.get_neighbors() if neighbor.code == code)
+            path.append(state)
+        return path, iterations
+    finally:
+        if report is not None:
+            report['histogram'] = histogram
+        if temporary:
+            shutil.rmtree(directory, ignore_errors=True)
+
+def depth_histogram(initial_state=None, directory=None, run_size=1 << 20, size=SIZE):
+    """Counts the boards at every distance from a board (the goal by default) with external memory
+    BFS, keeping only the last three layers on disk.
+
+    Args:
+        initial_state (_type_, optional): board to count from. Defaults to None (the goal).
+        directory (_type_, optional): where the layer files go. Defaults to None (a temporary directory).
+        run_size (int, optional): most codes held in memory while generating a layer. Defaults to 1 << 20.
+        size (_type_, optional): width of the goal board when no initial_state is given. Defaults to SIZE.
+
+    Returns:
+        _type_: list, number of boards at each depth. Its length - 1 is the largest distance.
+    """
+    import shutil
+    import tempfile
+
+    if initial_state is None:
+        initial_state = PuzzleState(board_geometry(size).goal_code, size * size - 1, size=size)
+    temporary = directory is None
+    if temporary:
+        directory = tempfile.mkdtemp(prefix="bfs_")
+    try:
+        return [count for _, _, count in external_layers(initial_state.code, directory, run_size, False, initial_state.size)]
+    finally:
+        if temporary:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
 ###########################################################
 ###   A* IMPLEMENTATION   #################################
 ###########################################################
@@ -145,52 +729,160 @@ def heuristic(state):
     Returns:
         _type_: estimated cost of the future path to goal
     """    
-    #creates a dictionary of the goal state and the tile position 
-    #to enable us to understand the costs of getting to the goal state
-    goal_positions = {1: (0, 0), 2: (0, 1), 3: (0, 2), 4: (1, 0), 5: (1, 1), 6: (1, 2), 7: (2, 0), 8: (2, 1)}
-    cost = 0
-    #for each tile on the board (except empty tile) calculate the *manhattan distance* 
-    #from its current position to its goal position
-    for i in range(3):
-        for j in range(3):
-            #ignore the empty tile
-            if state.board[i][j] != 0:
-                #get the goal position for our current tile we are looking at
-                goal_x, goal_y = goal_positions[state.board[i][j]]
-                #manhattan distance function between goal state and current state; add to cost
-                cost += abs(goal_x - i) + abs(goal_y - j)
-    return cost
+    #states carry their h(n), updated in O(1) on every move by get_neighbors()
+    return state.h
+
+class BucketQueue:
+    def __init__(self):
+        """Priority queue for small non-negative integer priorities such as f = g + h.
+        buckets[priority][g] is a LIFO list, so push and pop-min are O(1) (amortised)
+        with no comparisons between states. Ties on priority go to the larger g,
+        the node closest to a solution.
+        """
+        self.buckets = []
+        #number of items under each priority, and the highest g that may be non-empty
+        self.counts = []
+        self.top_g = []
+        self.min_priority = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def peek(self):
+        """The lowest priority in the queue without removing anything. The queue must not be empty."""
+        priority = self.min_priority
+        while not self.counts[priority]:
+            priority += 1
+        self.min_priority = priority
+        return priority
+
+    def push(self, priority, g, item):
+        while len(self.buckets) <= priority:
+            self.buckets.append([])
+            self.counts.append(0)
+            self.top_g.append(0)
+        bucket = self.buckets[priority]
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(item)
+        self.counts[priority] += 1
+        if g > self.top_g[priority]:
+            self.top_g[priority] = g
+        if priority < self.min_priority or self.size == 0:
+            self.min_priority = priority
+        self.size += 1
+
+    def pop(self):
+        """Removes the most recently pushed item with the lowest priority and largest g.
 
-def astar(initial_state):
+        Returns:
+            _type_: (priority, g, item)
+        """
+        priority = self.min_priority
+        while not self.counts[priority]:
+            priority += 1
+        self.min_priority = priority
+        bucket = self.buckets[priority]
+        g = self.top_g[priority]
+        while not bucket[g]:
+            g -= 1
+        self.top_g[priority] = g
+        self.counts[priority] -= 1
+        self.size -= 1
+        return priority, g, bucket[g].pop()
+
+def astar(initial_state, heuristic_fn=None, bidirectional=False, cache=None, stats=None):
     """A* uses heuristics to guide itself towards the goal state
     uses a priority queue to look at the lowest costing path which is based on
     the heuristic() function.
 
     Args:
         initial_state (_type_): starting state of the puzzle board
+        heuristic_fn (_type_, optional): alternate heuristic, a name in HEURISTICS or called as heuristic_fn(state),
+            e.g. a PatternDatabase. Defaults to None (the manhattan h each state carries).
+        bidirectional (bool, optional): search from the goal at the same time, see bidirectional_astar(). Defaults to False.
+        cache (_type_, optional): a SolutionCache. Boards it knows get their exact distance as h, the search
+            finishes as soon as one of them is popped, and the solution found is recorded in it. Defaults to None.
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
 
     Returns:
         _type_: list of neighbors if a solution was found
     """    
-    frontier = []
-    #priority queue with items organized by priority (priority,state)
+    if bidirectional:
+        return bidirectional_astar(initial_state, heuristic_fn, stats)
+    if not is_solvable(initial_state):
+        return None, 0
+    heuristic_fn = _heuristic_for(heuristic_fn, initial_state.size)
+    #remaining moves of the boards found in the cache
+    cached_moves = {}
+    hit = False
+
+    def estimate(state):
+        if cache is not None:
+            entry = cache.lookup(state.code)
+            if entry is not None:
+                cached_moves[state.code] = entry
+                return entry[0]
+        if heuristic_fn is None:
+            return state.h
+        if stats is None:
+            return heuristic_fn(state)
+        start_time = time.perf_counter()
+        h = heuristic_fn(state)
+        stats.heuristic_time += time.perf_counter() - start_time
+        return h
+
+    frontier = BucketQueue()
+    #priority queue with items organized by priority f = g + h
     #the priority is the result of the heuristic function on that state
     #add the initial state to the priority queue
-    heapq.heappush(frontier, (heuristic(initial_state), initial_state))
-    explored = set()
+    frontier.push(estimate(initial_state), 0, initial_state)
+    #cheapest g each board has been reached with, anything worse is a duplicate
+    best_g = {initial_state.code: 0}
     iterations = 0
     while frontier and iterations <= MAX_ITERATION:
         #start with the state with the lowest cost
-        _, state = heapq.heappop(frontier)
-        #if state is the goal state, done; follow its parent states
+        if stats is not None:
+            start_time = time.perf_counter()
+        f, g, state = frontier.pop()
+        if stats is not None:
+            stats.queue_time += time.perf_counter() - start_time
+        #skip stale entries, the board was reached more cheaply after this was pushed
+        if g > best_g[state.code]:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
+        #a cached board has its exact distance as h, so nothing left on the frontier can beat it
+        if state.code in cached_moves:
+            state = cache.finish(state, *cached_moves[state.code])
+            hit = True
+        #if state is the goal state, done; decode its moves into the path
         if state.is_goal():
+            if cache is not None:
+                cache.record(state, hit)
             return state.get_path(), iterations
-        #mark as visited
-        explored.add(state)
-        #add next neighbors to the priority queue if not already visited
-        for neighbor in state.get_neighbors():
-            if neighbor not in explored:
-                heapq.heappush(frontier, (neighbor.depth + heuristic(neighbor), neighbor))
+        if stats is None:
+            neighbors = state.get_neighbors()
+        else:
+            stats.expand(f, len(frontier), len(best_g) - len(frontier))
+            start_time = time.perf_counter()
+            neighbors = state.get_neighbors()
+            stats.expansion_time += time.perf_counter() - start_time
+            stats.generated += len(neighbors)
+        #add next neighbors to the priority queue if they were not reached more cheaply already
+        for neighbor in neighbors:
+            if neighbor.depth < best_g.get(neighbor.code, neighbor.depth + 1):
+                best_g[neighbor.code] = neighbor.depth
+                f = neighbor.depth + estimate(neighbor)
+                if stats is None:
+                    frontier.push(f, neighbor.depth, neighbor)
+                else:
+                    start_time = time.perf_counter()
+                    frontier.push(f, neighbor.depth, neighbor)
+                    stats.queue_time += time.perf_counter() - start_time
+            elif stats is not None:
+                stats.duplicates += 1
         iterations += 1
     return None, None
 
@@ -208,34 +900,667 @@ def astar(initial_state):
 #     print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
 
 
+###########################################################
+###   HEURISTIC REGISTRY   ################################
+###########################################################
+
+# Admissible heuristics by name, for every solver that takes heuristic_fn. Each entry builds
+# the heuristic for one board width, so its tables are only computed the first time it is
+# used. "max(a, b, ...)" takes the largest of several, which is still admissible.
+
+_linear_conflict_tables = {}
+
+def linear_conflict_tables(size=SIZE):
+    """Precomputes the linear conflict cost of every line of tiles. Two tiles that both
+    belong in a line but are in the wrong order there force one of them to leave the line
+    and come back, 2 extra moves on top of manhattan distance. The cost of a line is 2 *
+    (tiles in their goal line - longest run already in the right order).
+    Only the tiles that belong in a line matter, so a line is reduced to one digit per cell:
+    0 for a tile from elsewhere, otherwise 1 + where along the line the tile belongs. Every
+    line shares one table over those digits, (size + 1) ** size entries, which is small
+    enough for 5x5 boards. Built once per board width.
+
+    Args:
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: (costs, lines). costs is a bytearray indexed by sum(digit_k * (size + 1) ** k)
+            over the cells of a line, and lines lists (cells, digits) for the rows then the
+            columns, where digits[tile] is that tile's digit in the line
+    """
+    if size in _linear_conflict_tables:
+        return _linear_conflict_tables[size]
+    from itertools import product
+
+    costs = bytearray((size + 1) ** size)
+    for digits in product(range(size + 1), repeat=size):
+        #goal position along the line of each tile that belongs in this line, in the order they sit
+        order = [digit for digit in digits if digit]
+        #longest increasing subsequence, the tiles that can stay put
+        longest = [1] * len(order)
+        for i in range(len(order)):
+            for j in range(i):
+                if order[j] < order[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        index = 0
+        for k, digit in enumerate(digits):
+            index += digit * (size + 1) ** k
+        costs[index] = 2 * (len(order) - max(longest, default=0))
+    cells = size * size
+    lines = []
+    for is_row in (True, False):
+        for line in range(size):
+            line_cells = [size * line + k if is_row else size * k + line for k in range(size)]
+            digits = bytearray(cells)
+            for tile in range(1, cells):
+                goal_row, goal_col = divmod(tile - 1, size)
+                if (goal_row if is_row else goal_col) == line:
+                    digits[tile] = 1 + (goal_col if is_row else goal_row)
+            lines.append((line_cells, digits))
+    _linear_conflict_tables[size] = costs, lines
+    return costs, lines
+
+def linear_conflict_heuristic(size=SIZE):
+    """Manhattan distance plus linear conflicts, a table lookup per row and column.
+
+    Args:
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: heuristic called as h(state)
+    """
+    geometry = board_geometry(size)
+    tile_bits = geometry.tile_bits
+    tile_mask = geometry.tile_mask
+    costs, lines = linear_conflict_tables(size)
+    #for every cell of every line, its shift in the packed board and what each tile there
+    #adds to the line's index in costs
+    lines = [[(tile_bits * cell, [digit * (size + 1) ** k for digit in digits]) for k, cell in enumerate(line_cells)]
+             for line_cells, digits in lines]
+
+    def linear_conflict(state):
+        code = state.code
+        h = state.h
+        for parts in lines:
+            index = 0
+            for shift, weights in parts:
+                index += weights[(code >> shift) & tile_mask]
+            h += costs[index]
+        return h
+
+    return linear_conflict
+
+def walking_distance_table(size=SIZE):
+    """Precomputes walking distance: the board is reduced to how many tiles of each goal row sit
+    in each row, plus the row of the empty tile, and every such pattern gets the number of
+    vertical moves it needs by BFS back from the goal. Columns reduce to the same patterns.
+
+    Args:
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: dict from (counts row by row..., empty row) to the number of moves
+    """
+    #24964 patterns for 4x4, but far too many to search in python for 5x5
+    if size > 4:
+        raise ValueError(f"walking distance is only tabulated up to 4x4 boards, not {size}x{size}")
+    counts = [size if row == goal_row else 0 for row in range(size) for goal_row in range(size)]
+    counts[-1] -= 1
+    start = (*counts, size - 1)
+    table = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        pattern = frontier.popleft()
+        distance = table[pattern] + 1
+        empty_row = pattern[-1]
+        for row in (empty_row - 1, empty_row + 1):
+            if not 0 <= row < size:
+                continue
+            #any tile of the neighbouring row can slide into the empty tile's row
+            for goal_row in range(size):
+                if pattern[size * row + goal_row]:
+                    counts = list(pattern)
+                    counts[size * row + goal_row] -= 1
+                    counts[size * empty_row + goal_row] += 1
+                    counts[-1] = row
+                    counts = tuple(counts)
+                    if counts not in table:
+                        table[counts] = distance
+                        frontier.append(counts)
+    return table
+
+def walking_distance_heuristic(size=SIZE):
+    """Walking distance, the vertical plus the horizontal moves from walking_distance_table().
+    Dominates manhattan distance, but is not additive with linear conflicts.
+
+    Args:
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: heuristic called as h(state)
+    """
+    geometry = board_geometry(size)
+    tile_bits = geometry.tile_bits
+    tile_mask = geometry.tile_mask
+    table = walking_distance_table(size)
+    #where each cell's counts go for a tile, by goal row and goal column
+    cells = [(size * (index // size), size * (index % size), tile_bits * index) for index in range(geometry.cells)]
+    goals = [divmod((tile - 1) % geometry.cells, size) for tile in range(geometry.cells)]
+
+    def walking_distance(state):
+        code = state.code
+        rows = [0] * (geometry.cells + 1)
+        columns = [0] * (geometry.cells + 1)
+        for row, column, shift in cells:
+            tile = (code >> shift) & tile_mask
+            if tile:
+                goal_row, goal_column = goals[tile]
+                rows[row + goal_row] += 1
+                columns[column + goal_column] += 1
+        rows[-1], columns[-1] = divmod(state.empty_index, size)
+        return table[tuple(rows)] + table[tuple(columns)]
+
+    return walking_distance
+
+def max_heuristic(*heuristics):
+    """Combines admissible heuristics into one that takes the largest estimate.
+
+    Returns:
+        _type_: heuristic called as h(state)
+    """
+    def largest(state):
+        return max(heuristic_fn(state) for heuristic_fn in heuristics)
+
+    return largest
+
+#name -> builder taking the board width
+HEURISTICS = {
+    "manhattan": lambda size: heuristic,
+    "linear_conflict": linear_conflict_heuristic,
+    "walking_distance": walking_distance_heuristic,
+    #building takes under a second for 3x3 but minutes for 4x4, which has to be done on purpose first
+    "pattern_database": lambda size: pattern_database(size, build=size == 3),
+}
+
+_heuristics = {}
+
+def get_heuristic(name, size=SIZE):
+    """Looks a heuristic up by name, e.g. "linear_conflict" or "max(linear_conflict, walking_distance)".
+
+    Args:
+        name (_type_): key of HEURISTICS, a max(...) of them, or already a heuristic, which is returned as it is
+        size (_type_, optional): width of the board. Defaults to SIZE.
+
+    Returns:
+        _type_: heuristic called as h(state)
+    """
+    if not isinstance(name, str):
+        return name
+    name = name.replace(" ", "")
+    if (name, size) not in _heuristics:
+        if name.startswith("max(") and name.endswith(")"):
+            _heuristics[name, size] = max_heuristic(*(get_heuristic(part, size) for part in name[4:-1].split(",")))
+        elif name in HEURISTICS:
+            _heuristics[name, size] = HEURISTICS[name](size)
+        else:
+            raise ValueError(f"unknown heuristic {name!r}, expected one of {sorted(HEURISTICS)} or max(...) of them")
+    return _heuristics[name, size]
+
+def _heuristic_for(heuristic_fn, size):
+    #None stands for the manhattan h every state already carries, which needs no call at all
+    heuristic_fn = get_heuristic(heuristic_fn, size)
+    return None if heuristic_fn is heuristic else heuristic_fn
+
+
+###########################################################
+###   PATTERN DATABASE IMPLEMENTATION   ###################
+###########################################################
+
+# A pattern database (PDB) stores, for every placement of a group of tiles, the exact number of
+# moves of those tiles needed to bring them home. Moves of tiles outside the group are free, so
+# the groups are disjoint and their values can be added together and stay admissible.
+# The tables are built once per board size, written to a binary file and memory-mapped on load.
+
+PDB_MAGIC = b"PDB1"
+#the search over a group of k tiles needs cells! / (cells - k - 1)! bytes: 15120 for 4 tiles of
+#the 8-puzzle, 5.8 MB for 5 tiles of the 15-puzzle (a 7-8 split would need 4 GB)
+DEFAULT_PATTERNS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)),
+}
+
+def _partial_permutations(n, k):
+    #number of ordered ways to pick k of n items, n! / (n - k)!
+    count = 1
+    for i in range(n - k + 1, n + 1):
+        count *= i
+    return count
+
+def _rank_positions(positions, cells):
+    """Perfect hash of k distinct cells out of `cells`: its rank among all
+    ordered selections, a number in range(cells! / (cells - k)!).
+
+    Args:
+        positions (_type_): sequence of distinct cell indices
+        cells (_type_): number of cells on the board
+
+    Returns:
+        _type_: rank of the selection
+    """
+    k = len(positions)
+    rank = 0
+    for i, position in enumerate(positions):
+        #how many cells smaller than this one are still free
+        digit = position
+        for earlier in positions[:i]:
+            if earlier < position:
+                digit -= 1
+        rank += digit * _partial_permutations(cells - 1 - i, k - 1 - i)
+    return rank
+
+def _unrank_positions(rank, cells, k):
+    """Inverse of _rank_positions(): the k cells with this rank.
+
+    Args:
+        rank (_type_): number in range(cells! / (cells - k)!)
+        cells (_type_): number of cells on the board
+        k (_type_): number of cells picked
+
+    Returns:
+        _type_: list of the cell indices
+    """
+    free = list(range(cells))
+    positions = []
+    for i in range(k):
+        digit, rank = divmod(rank, _partial_permutations(cells - 1 - i, k - 1 - i))
+        positions.append(free.pop(digit))
+    return positions
+
+def build_pattern_database(size, patterns):
+    """Builds one table per tile group with a retrograde breadth first search from the goal.
+    The abstract state is the cells of the group's tiles plus the empty cell. Sliding a
+    group tile costs 1 and sliding any other tile costs 0, so every empty cell the empty
+    tile can reach without moving a group tile has the same cost: a state only keeps the
+    lowest of those cells, found by flood fill. The search goes one cost layer at a time,
+    scanning the distance array for the states of the current layer (bytearray.find, so
+    the scan itself runs in C), which needs no queue and no memory beyond the array. Each
+    table keeps the smallest cost over every position of the empty tile.
+
+    Args:
+        size (_type_): width of the board, 3 for the 8-puzzle and 4 for the 15-puzzle
+        patterns (_type_): disjoint groups of tiles, e.g. ((1, 2, 3, 4), (5, 6, 7, 8))
+
+    Returns:
+        _type_: list of bytearrays, tables[g][rank of the group's cells] = moves
+    """
+    cells = size * size
+    neighbors = []
+    for index in range(cells):
+        x, y = divmod(index, size)
+        neighbors.append([size * (x + dx) + y + dy
+                          for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                          if 0 <= x + dx < size and 0 <= y + dy < size])
+
+    def region(tiles, empty):
+        #every cell the empty tile reaches without moving a group tile
+        reached = [empty]
+        for cell in reached:
+            for target in neighbors[cell]:
+                if target not in tiles and target not in reached:
+                    reached.append(target)
+        return reached
+
+    tables = []
+    for pattern in patterns:
+        k = len(pattern)
+        #in the goal tile t sits on cell t - 1 and the empty tile on the last cell
+        goal = [tile - 1 for tile in pattern]
+        #distance of every (group cells, lowest empty cell) state, 255 = not reached yet
+        distances = bytearray([255]) * _partial_permutations(cells, k + 1)
+        table = bytearray([255]) * _partial_permutations(cells, k)
+        distances[_rank_positions(goal + [min(region(goal, cells - 1))], cells)] = 0
+        cost = 0
+        found = True
+        while found:
+            found = False
+            rank = distances.find(cost)
+            while rank != -1:
+                found = True
+                state = _unrank_positions(rank, cells, k + 1)
+                tiles = state[:k]
+                tiles_rank = _rank_positions(tiles, cells)
+                if table[tiles_rank] == 255:
+                    table[tiles_rank] = cost
+                #a group tile next to the region slides into it, leaving the empty tile where it was
+                for empty in region(tiles, state[k]):
+                    for target in neighbors[empty]:
+                        if target in tiles:
+                            moved = tiles.index(target)
+                            child_tiles = tiles[:moved] + [empty] + tiles[moved + 1:]
+                            child = _rank_positions(child_tiles + [min(region(child_tiles, target))], cells)
+                            if distances[child] == 255:
+                                distances[child] = cost + 1
+                rank = distances.find(cost, rank + 1)
+            cost += 1
+        tables.append(table)
+    return tables
+
+def _replace_file(path, chunks):
+    #writes to a temporary file next to path and renames it over path, so an interrupted build
+    #leaves no truncated file behind and a process opening path sees nothing or the whole file
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def save_pattern_database(path, size, patterns, tables):
+    """Writes the tables to one compact binary file: a small header naming the board
+    size and the tile groups, followed by every table at one byte per entry.
+
+    Args:
+        path (_type_): file to write
+        size (_type_): width of the board
+        patterns (_type_): the tile groups the tables were built for
+        tables (_type_): output of build_pattern_database()
+    """
+    header = PDB_MAGIC + struct.pack("BB", size, len(patterns))
+    for pattern in patterns:
+        header += struct.pack("B", len(pattern)) + bytes(pattern)
+    _replace_file(path, [header, *tables])
+
+class PatternDatabase:
+    def __init__(self, path):
+        """Memory-maps a file written by save_pattern_database(). Nothing is read up front,
+        the OS pages the tables in as lookups touch them.
+
+        Args:
+            path (_type_): the database file
+        """
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[:4] != PDB_MAGIC:
+            raise ValueError(f"{path} is not a pattern database file")
+        self.size, group_count = struct.unpack_from("BB", self.buffer, 4)
+        self.cells = self.size * self.size
+        self.tile_bits = _tile_bits(self.size)
+        offset = 6
+        self.patterns = []
+        for _ in range(group_count):
+            k = self.buffer[offset]
+            self.patterns.append(tuple(self.buffer[offset + 1:offset + 1 + k]))
+            offset += 1 + k
+        #where each table starts in the file
+        self.offsets = []
+        for pattern in self.patterns:
+            self.offsets.append(offset)
+            offset += _partial_permutations(self.cells, len(pattern))
+
+    def lookup(self, code):
+        """Sum of the tables for a packed board.
+
+        Args:
+            code (_type_): the packed board
+
+        Returns:
+            _type_: admissible estimate of the moves left
+        """
+        mask = (1 << self.tile_bits) - 1
+        position_of = [0] * self.cells
+        for index in range(self.cells):
+            position_of[(code >> (self.tile_bits * index)) & mask] = index
+        total = 0
+        for pattern, offset in zip(self.patterns, self.offsets):
+            total += self.buffer[offset + _rank_positions([position_of[tile] for tile in pattern], self.cells)]
+        return total
+
+    def __call__(self, state):
+        return self.lookup(state.code)
+
+    def close(self):
+        self.buffer.close()
+
+def pattern_database_path(size, patterns=None):
+    #the default split keeps the plain name, any other split is spelled out in it so the two never share a file
+    name = f"pdb_{size}x{size}"
+    if patterns is not None and tuple(map(tuple, patterns)) != DEFAULT_PATTERNS.get(size):
+        name += "_" + "_".join("-".join(map(str, pattern)) for pattern in patterns)
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.bin")
+
+def pattern_database(size=3, patterns=None, path=None, build=True):
+    """Loads the pattern database for a board size, building and saving it first if
+    the file does not exist yet. Building is pure python: under a second for the
+    8-puzzle, a few minutes for the 5-5-5 split of the 15-puzzle.
+
+    Args:
+        size (int, optional): width of the board. Defaults to 3.
+        patterns (_type_, optional): tile groups. Defaults to DEFAULT_PATTERNS[size].
+        path (_type_, optional): database file. Defaults to pdb_<size>x<size>.bin next to this script,
+            with the tile groups added to the name when they are not the default ones.
+        build (bool, optional): build the file when it is missing, otherwise that is an error. Defaults to True.
+
+    Returns:
+        _type_: a PatternDatabase, usable as astar(state, heuristic_fn=...)
+
+    Raises:
+        ValueError: no patterns were given and DEFAULT_PATTERNS has none for this width,
+            or the file was built for another board size or other tile groups
+        FileNotFoundError: the file is missing and build is False
+    """
+    if patterns is None:
+        if size not in DEFAULT_PATTERNS:
+            raise ValueError(f"no default pattern database for {size}x{size} boards, "
+                             f"only {', '.join(f'{width}x{width}' for width in DEFAULT_PATTERNS)}; pass patterns")
+        patterns = DEFAULT_PATTERNS[size]
+    patterns = tuple(map(tuple, patterns))
+    path = path or pattern_database_path(size, patterns)
+    if not os.path.exists(path):
+        if not build:
+            hint = f"pattern_database({size})" if patterns == DEFAULT_PATTERNS.get(size) else f"pattern_database({size}, patterns={patterns})"
+            raise FileNotFoundError(f"{path} does not exist, build it once with {hint}")
+        save_pattern_database(path, size, patterns, build_pattern_database(size, patterns))
+    database = PatternDatabase(path)
+    #an existing file is only trusted if it holds the tables that were asked for
+    if database.size != size or tuple(database.patterns) != patterns:
+        database.close()
+        raise ValueError(f"{path} holds a {database.size}x{database.size} database for {database.patterns}, "
+                         f"not {size}x{size} for {list(patterns)}")
+    return database
+
+
+###########################################################
+###   DISTANCE ORACLE IMPLEMENTATION   ####################
+###########################################################
+
+# The 8-puzzle only has 9! / 2 = 181,440 solvable boards, few enough to store the optimal
+# distance of every one of them. A backward BFS from the goal fills one byte per board,
+# indexed by a perfect hash of the board, and the table is memory-mapped from disk.
+# Solving is then a walk downhill: each step moves to a neighbor one move closer.
+
+ORACLE_STATES = 181440
+_ORACLE_WEIGHTS = tuple(_partial_permutations(SIZE * SIZE - 1 - i, SIZE * SIZE - 3 - i) for i in range(SIZE * SIZE - 2))
+
+def permutation_rank(code):
+    """Perfect hash of a solvable packed board into range(181440). This is the
+    Lehmer code of the cells holding the empty tile and tiles 1-6. Tiles 7 and 8
+    fill the last two free cells, and only one of the two orders is solvable
+    (swapping them flips the parity), so they are left out.
+
+    Args:
+        code (_type_): the packed board
+
+    Returns:
+        _type_: the board's index in the distance table
+    """
+    cell_of = [0] * (SIZE * SIZE)
+    for index in range(SIZE * SIZE):
+        cell_of[(code >> (TILE_BITS * index)) & TILE_MASK] = index
+    rank = 0
+    used = 0
+    for tile in range(SIZE * SIZE - 2):
+        cell = cell_of[tile]
+        #free cells before this one
+        rank += (cell - (used & ((1 << cell) - 1)).bit_count()) * _ORACLE_WEIGHTS[tile]
+        used |= 1 << cell
+    return rank
+
+def build_distance_table():
+    """Breadth first search backwards from the goal over every solvable board.
+
+    Returns:
+        _type_: bytearray, table[permutation_rank(code)] = optimal number of moves
+    """
+    table = bytearray([255]) * ORACLE_STATES
+    table[permutation_rank(GOAL_CODE)] = 0
+    #the board and the index of its empty tile
+    frontier = deque([(GOAL_CODE, SIZE * SIZE - 1)])
+    while frontier:
+        code, empty_index = frontier.popleft()
+        distance = table[permutation_rank(code)] + 1
+        empty_shift = TILE_BITS * empty_index
+        for target in NEIGHBOR_INDICES[empty_index]:
+            target_shift = TILE_BITS * target
+            tile = (code >> target_shift) & TILE_MASK
+            new_code = code - (tile << target_shift) + (tile << empty_shift)
+            rank = permutation_rank(new_code)
+            if table[rank] == 255:
+                table[rank] = distance
+                frontier.append((new_code, target))
+    return table
+
+class DistanceOracle:
+    def __init__(self, path):
+        """Memory-maps a distance table written by distance_oracle().
+
+        Args:
+            path (_type_): the table file, one byte per solvable board
+        """
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) != ORACLE_STATES:
+            raise ValueError(f"{path} is not an 8-puzzle distance table")
+
+    def distance(self, code):
+        return self.buffer[permutation_rank(code)]
+
+    def __call__(self, state):
+        #the exact distance is also a perfect heuristic, e.g. astar(state, heuristic_fn=oracle)
+        return self.distance(state.code)
+
+    def close(self):
+        self.buffer.close()
+
+_oracles = {}
+
+def distance_oracle(path=None):
+    """Loads the distance table, building and saving it first if the file does not exist
+    yet. Loaded tables are kept so repeated calls do not map the file again.
+
+    Args:
+        path (_type_, optional): table file. Defaults to oracle_3x3.bin next to this script.
+
+    Returns:
+        _type_: a DistanceOracle
+    """
+    path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "oracle_3x3.bin")
+    if path not in _oracles:
+        if not os.path.exists(path):
+            _replace_file(path, [build_distance_table()])
+        _oracles[path] = DistanceOracle(path)
+    return _oracles[path]
+
+def oracle_solve(initial_state, oracle=None, stats=None):
+    """Solves a board optimally without searching by walking downhill through the distance table.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        oracle (_type_, optional): a DistanceOracle. Defaults to distance_oracle().
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
+
+    Returns:
+        _type_: the optimal path and the number of table lookups
+    """
+    #the table only holds solvable boards, an unsolvable one would hash onto its solvable twin
+    if not is_solvable(initial_state):
+        return None, 0
+    if initial_state.size != SIZE:
+        raise ValueError("the distance oracle only covers 3x3 boards")
+    oracle = oracle or distance_oracle()
+    state = initial_state
+    distance = oracle.distance(state.code)
+    iterations = 1
+    while distance > 0:
+        if stats is None:
+            neighbors = state.get_neighbors()
+        else:
+            stats.expand(distance, 0, 0)
+            start_time = time.perf_counter()
+            neighbors = state.get_neighbors()
+            stats.expansion_time += time.perf_counter() - start_time
+        for neighbor in neighbors:
+            iterations += 1
+            #the table lookup is an exact heuristic, its time counts as heuristic_time
+            if stats is None:
+                lookup = oracle.distance(neighbor.code)
+            else:
+                stats.generated += 1
+                start_time = time.perf_counter()
+                lookup = oracle.distance(neighbor.code)
+                stats.heuristic_time += time.perf_counter() - start_time
+            if lookup == distance - 1:
+                state = neighbor
+                break
+        distance -= 1
+    return state.get_path(), iterations
+
+
 
 ###########################################################
 ###   DFS IMPLEMENTATION   ################################
 ###########################################################
 
-def dfs(initial_state):
+def dfs(initial_state, stats=None):
     """
         Depth First Search algorithm takes each board configuration possibly and checks by depth
         This algorithm will do this until a solution is found if possible
 
     Args:
         initial_state (_type_): Takes the intial state of the board as a parameter
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
 
     Returns:
         _type_: None
     """    
+    if not is_solvable(initial_state):
+        return None, 0
     frontier = [initial_state]
-    explored = set()   # creates a set of paths to not be repeated
+    seen = {initial_state}   # explored states plus everything on the frontier, so neither is repeated
     iterations = 0
     while frontier and iterations <= MAX_ITERATION:
         state = frontier.pop()
         # print_board(state)
         if state.is_goal(): # Checks to see if current state == goal state, if yes then it returns and gets path, if no then keep running
             return state.get_path(), iterations
-        explored.add(state) # adds current state to the set to not be repeated
-        for neighbor in state.get_neighbors():
-            if neighbor not in explored and neighbor not in frontier: # Grabs the next state that has not been visisted or explored
+        if stats is not None:
+            stats.expand(state.depth, len(frontier), len(seen) - len(frontier))
+            start_time = time.perf_counter()
+        neighbors = state.get_neighbors()
+        if stats is not None:
+            stats.expansion_time += time.perf_counter() - start_time
+            stats.generated += len(neighbors)
+        for neighbor in neighbors:
+            if neighbor not in seen: # Grabs the next state that has not been visisted or explored
+                seen.add(neighbor)
                 frontier.append(neighbor)
+            elif stats is not None:
+                stats.duplicates += 1
         iterations += 1
     return None, None
 
@@ -259,29 +1584,54 @@ def dfs(initial_state):
 
 # ********** THIS ALSO USES THE HUERISTIC FUNCTION IN A* ALGORITHM *********
 
-def greedy_best_first(initial_state):
+def greedy_best_first(initial_state, heuristic_fn=None, stats=None):
     """
        This uses the Hueristic function to calculate the least cost effective path and 
        will take it even if the next path is not towards the solution
 
     Args:
         initial_state (_type_): Takes the intial state of the board as a parameter
+        heuristic_fn (_type_, optional): a name in HEURISTICS or called as heuristic_fn(state). Defaults to None (manhattan).
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
 
     Returns:
         _type_: None
     """    
-    frontier = []
-    heapq.heappush(frontier, (heuristic(initial_state), initial_state))
-    explored = set()
+    if not is_solvable(initial_state):
+        return None, 0
+    estimate = _heuristic_for(heuristic_fn, initial_state.size) or heuristic
+    frontier = BucketQueue()
+    frontier.push(estimate(initial_state), 0, initial_state)
+    best_g = {initial_state.code: 0}   # cheapest g each board has been reached with, so duplicates are not repeated
     iterations = 0
     while frontier and iterations <= MAX_ITERATION:
-        _, state = heapq.heappop(frontier) # unpacks and pops the heapq's smallest element and stores that value into 'state'
+        if stats is not None:
+            start_time = time.perf_counter()
+        h, g, state = frontier.pop() # pops the state with the smallest h, ties go to the deeper state
+        if stats is not None:
+            stats.queue_time += time.perf_counter() - start_time
+        if g > best_g[state.code]: # stale entry, the board was reached more cheaply since
+            if stats is not None:
+                stats.duplicates += 1
+            continue
         if state.is_goal(): # if the current state matches the goal state then the algorithm finishes and returns the complete path to the solution
             return state.get_path(), iterations
-        explored.add(state) # adds current state to the set to not be repeated
-        for neighbor in state.get_neighbors():
-            if neighbor not in explored:
-                heapq.heappush(frontier, (heuristic(neighbor), neighbor)) # Grabs the next state that has not been visisted or explored
+        if stats is not None:
+            stats.expand(h, len(frontier), len(best_g) - len(frontier))
+            start_time = time.perf_counter()
+        neighbors = state.get_neighbors()
+        if stats is not None:
+            stats.expansion_time += time.perf_counter() - start_time
+            stats.generated += len(neighbors)
+            start_time = time.perf_counter()
+        for neighbor in neighbors:
+            if neighbor.depth < best_g.get(neighbor.code, neighbor.depth + 1):
+                best_g[neighbor.code] = neighbor.depth
+                frontier.push(estimate(neighbor), neighbor.depth, neighbor) # Grabs the next state that has not been visisted or explored
+            elif stats is not None:
+                stats.duplicates += 1
+        if stats is not None:
+            stats.queue_time += time.perf_counter() - start_time
         iterations += 1
     return None, None
 
@@ -396,7 +1746,7 @@ def greedy_best_first(initial_state):
 #             break
 #     return None, None
 
-def ids(initial_state, max_depth=50):
+def ids(initial_state, max_depth=50, stats=None):
     def dfs_limited(state, depth_limit, iterations):
         stack = [(state, 0)]
         while stack and iterations[0] < MAX_ITERATION:
@@ -404,10 +1754,21 @@ def ids(initial_state, max_depth=50):
             if current_state.is_goal():
                 return current_state.get_path(), iterations[0]
             if depth < depth_limit:
-                stack.extend((neighbor, depth + 1) for neighbor in reversed(current_state.get_neighbors()))
+                if stats is None:
+                    stack.extend((neighbor, depth + 1) for neighbor in reversed(current_state.get_neighbors()))
+                else:
+                    #layers are the depth limit of each round
+                    stats.expand(depth_limit, len(stack), 0)
+                    start_time = time.perf_counter()
+                    neighbors = current_state.get_neighbors()
+                    stats.expansion_time += time.perf_counter() - start_time
+                    stats.generated += len(neighbors)
+                    stack.extend((neighbor, depth + 1) for neighbor in reversed(neighbors))
             iterations[0] += 1
         return None, None
 
+    if not is_solvable(initial_state):
+        return None, 0
     iterations = [0]
     for depth in range(max_depth):
         result, total_iterations = dfs_limited(initial_state, depth, iterations)
@@ -431,7 +1792,1315 @@ def ids(initial_state, max_depth=50):
 # else:
 #     print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
 
-MAX_ITERATION = 10000
+
+###########################################################
+###   IDA* IMPLEMENTATION   ###############################
+###########################################################
+
+def idastar(initial_state, max_iterations=None, heuristic_fn=None, stats=None):
+    """Iterative Deepening A* runs depth first searches bounded by f = g + h, raising the
+    bound to the smallest f that went over it each round. There is one flat board that
+    is changed in place with move/undo, the incremental manhattan distance and the stack
+    of moves, so memory is O(depth) no matter how many nodes are expanded.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        max_iterations (_type_, optional): expansion limit. Defaults to MAX_ITERATION.
+        heuristic_fn (_type_, optional): admissible heuristic, a name in HEURISTICS or called as heuristic_fn(state).
+            Defaults to None (the incremental manhattan distance).
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
+
+    Returns:
+        _type_: optimal path and number of iterations, (None, None) if the limit ran out
+    """
+    if not is_solvable(initial_state):
+        return None, 0
+    max_iterations = MAX_ITERATION if max_iterations is None else max_iterations
+    heuristic_fn = _heuristic_for(heuristic_fn, initial_state.size)
+    geometry = initial_state.geometry
+    tile_bits = geometry.tile_bits
+    tiles = [tile for row in initial_state.board for tile in row]
+    neighbor_moves = geometry.neighbor_moves
+    manhattan = geometry.manhattan
+    #move code of each step on the current path
+    moves = []
+    iterations = 0
+    found = -1
+
+    def search(empty, previous, g, h, code, bound):
+        nonlocal iterations
+        #h is the manhattan distance, kept up to date on every move; the packed code is only
+        #kept for heuristic_fn, which sees a state built from both
+        if heuristic_fn is None:
+            f = g + h
+        elif stats is None:
+            f = g + heuristic_fn(PuzzleState(code, empty, g, 0, h, geometry))
+        else:
+            start_time = time.perf_counter()
+            f = g + heuristic_fn(PuzzleState(code, empty, g, 0, h, geometry))
+            stats.heuristic_time += time.perf_counter() - start_time
+        if f > bound:
+            return f
+        #the manhattan distance is 0 only on the goal board
+        if h == 0:
+            return found
+        if iterations >= max_iterations:
+            return float('inf')
+        iterations += 1
+        if stats is not None:
+            #layers are the f bound of each round, the frontier is the current path. There is no
+            #queue, so queue_time stays 0 and expansion_time is the in-place moves and undos
+            stats.expand(bound, len(moves), 0)
+        smallest = float('inf')
+        for target, move in neighbor_moves[empty]:
+            #moving the empty tile straight back would undo the last move
+            if target == previous:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            if stats is not None:
+                stats.generated += 1
+                start_time = time.perf_counter()
+            tile = tiles[target]
+            new_h = h - manhattan[tile][target] + manhattan[tile][empty]
+            #move
+            tiles[empty], tiles[target] = tile, 0
+            moves.append(move)
+            if heuristic_fn is not None:
+                code = code - (tile << (tile_bits * target)) + (tile << (tile_bits * empty))
+            if stats is not None:
+                stats.expansion_time += time.perf_counter() - start_time
+            result = search(target, empty, g + 1, new_h, code, bound)
+            if result == found:
+                return found
+            if stats is not None:
+                start_time = time.perf_counter()
+            #undo
+            moves.pop()
+            tiles[empty], tiles[target] = 0, tile
+            if heuristic_fn is not None:
+                code = code + (tile << (tile_bits * target)) - (tile << (tile_bits * empty))
+            if stats is not None:
+                stats.expansion_time += time.perf_counter() - start_time
+            if result < smallest:
+                smallest = result
+        return smallest
+
+    bound = initial_state.h if heuristic_fn is None else heuristic_fn(initial_state)
+    while True:
+        result = search(initial_state.empty_index, None, 0, initial_state.h, initial_state.code, bound)
+        if result == found:
+            break
+        if result == float('inf'):
+            return None, None
+        bound = result
+    #replay the moves to build the path of states
+    state = initial_state
+    for move in moves:
+        state = state.slide(move)
+    return state.get_path(), iterations
+
+
+###########################################################
+###   BIDIRECTIONAL SEARCH IMPLEMENTATION   ###############
+###########################################################
+
+# Searching forwards from the start and backwards from the goal at the same time means
+# each side only has to reach about half the solution depth. Moves can be undone, so the
+# backward search just uses get_neighbors() from the goal board.
+
+def _join_paths(forward_state, backward_state):
+    """Stitches the two halves together where the searches met. Both states are the same
+    board; the backward half is replayed on top of the forward one, undoing its moves
+    in reverse, so that depth and the move codes are correct all the way to the goal.
+
+    Args:
+        forward_state (_type_): state reached from the start
+        backward_state (_type_): the same board reached from the goal
+
+    Returns:
+        _type_: path from the start board to the goal board
+    """
+    state = forward_state
+    while backward_state.depth:
+        state = state.slide((backward_state.moves & 3) ^ 1)
+        backward_state = backward_state.parent
+    return state.get_path()
+
+def bidirectional_bfs(initial_state, stats=None):
+    """Breadth first search from both ends, always expanding a whole layer of the side with
+    the smaller frontier. When a layer touches the other side, every meeting found in that
+    layer is compared and the shortest is kept, so the path is optimal.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
+
+    Returns:
+        _type_: optimal path and number of iterations
+    """
+    if not is_solvable(initial_state):
+        return None, 0
+    geometry = initial_state.geometry
+    goal_state = PuzzleState(geometry.goal_code, geometry.cells - 1, size=geometry)
+    if initial_state.is_goal():
+        return initial_state.get_path(), 0
+    #every state each side has reached, by packed board
+    forward_seen = {initial_state.code: initial_state}
+    backward_seen = {goal_state.code: goal_state}
+    forward_frontier = [initial_state]
+    backward_frontier = [goal_state]
+    iterations = 0
+    while forward_frontier and backward_frontier and iterations <= MAX_ITERATION:
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, seen, other_seen, forward = forward_frontier, forward_seen, backward_seen, True
+        else:
+            frontier, seen, other_seen, forward = backward_frontier, backward_seen, forward_seen, False
+        next_frontier = []
+        best = None
+        for state in frontier:
+            if stats is None:
+                neighbors = state.get_neighbors()
+            else:
+                stats.expand(state.depth, len(forward_frontier) + len(backward_frontier) + len(next_frontier),
+                             len(forward_seen) + len(backward_seen))
+                start_time = time.perf_counter()
+                neighbors = state.get_neighbors()
+                stats.expansion_time += time.perf_counter() - start_time
+                stats.generated += len(neighbors)
+            for neighbor in neighbors:
+                if neighbor.code in seen:
+                    if stats is not None:
+                        stats.duplicates += 1
+                    continue
+                seen[neighbor.code] = neighbor
+                next_frontier.append(neighbor)
+                other = other_seen.get(neighbor.code)
+                if other is not None and (best is None or neighbor.depth + other.depth < best[0]):
+                    best = (neighbor.depth + other.depth, neighbor, other)
+            iterations += 1
+        if best:
+            _, meeting, other = best
+            if forward:
+                return _join_paths(meeting, other), iterations
+            return _join_paths(other, meeting), iterations
+        if forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    return None, None
+
+def bidirectional_astar(initial_state, heuristic_fn=None, stats=None):
+    """Bidirectional heuristic search with the MM meet-in-the-middle rule. Each side is
+    ordered by pr(n) = max(g + h, 2g), so neither search goes past the middle before
+    the two meet. The forward side uses the normal heuristic and the backward side
+    uses the manhattan distance back to the start board. The best meeting found so
+    far (U) is returned once
+        U <= max(C, fmin_forward, fmin_backward, gmin_forward + gmin_backward + 1)
+    where C is the smallest pr on either side. At that point no shorter path can be left.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        heuristic_fn (_type_, optional): forward heuristic, like astar(). Defaults to None (manhattan).
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
+
+    Returns:
+        _type_: optimal path and number of iterations
+    """
+    if not is_solvable(initial_state):
+        return None, 0
+    geometry = initial_state.geometry
+    start_table = manhattan_table(initial_state.code, geometry.size)
+    heuristics = (
+        _heuristic_for(heuristic_fn, initial_state.size) or (lambda state: state.h),
+        lambda state: manhattan_distance(state.code, start_table),
+    )
+    goal_state = PuzzleState(geometry.goal_code, geometry.cells - 1, size=geometry)
+    #per direction (0 forward, 1 backward): open and closed states by packed board and
+    #three heaps over the open states, ordered by pr, f and g, with stale entries skipped lazily
+    opened = ({}, {})
+    closed = ({}, {})
+    heaps = (([], [], []), ([], [], []))
+
+    def push(direction, state):
+        opened[direction][state.code] = state
+        g = state.depth
+        if stats is None:
+            f = g + heuristics[direction](state)
+        else:
+            start_time = time.perf_counter()
+            f = g + heuristics[direction](state)
+            stats.heuristic_time += time.perf_counter() - start_time
+        pr_heap, f_heap, g_heap = heaps[direction]
+        heapq.heappush(pr_heap, (max(f, 2 * g), g, state.code))
+        heapq.heappush(f_heap, (f, g, state.code))
+        heapq.heappush(g_heap, (g, g, state.code))
+
+    def minimum(direction, which):
+        #smallest live entry of a heap, dropping entries for states that were expanded or improved
+        heap = heaps[direction][which]
+        while heap:
+            value, g, code = heap[0]
+            state = opened[direction].get(code)
+            if state is not None and state.depth == g:
+                return value, code
+            heapq.heappop(heap)
+        return float('inf'), None
+
+    push(0, initial_state)
+    push(1, goal_state)
+    best_cost = 0 if initial_state.is_goal() else float('inf')
+    meeting = (initial_state, goal_state) if best_cost == 0 else None
+    iterations = 0
+    while opened[0] and opened[1] and iterations <= MAX_ITERATION:
+        if stats is not None:
+            start_time = time.perf_counter()
+        pr_forward, code_forward = minimum(0, 0)
+        pr_backward, code_backward = minimum(1, 0)
+        lower_bound = max(
+            min(pr_forward, pr_backward),
+            minimum(0, 1)[0],
+            minimum(1, 1)[0],
+            minimum(0, 2)[0] + minimum(1, 2)[0] + 1,
+        )
+        if stats is not None:
+            stats.queue_time += time.perf_counter() - start_time
+        if best_cost <= lower_bound:
+            break
+        direction, code = (0, code_forward) if pr_forward <= pr_backward else (1, code_backward)
+        state = opened[direction].pop(code)
+        closed[direction][code] = state
+        other = 1 - direction
+        if stats is None:
+            neighbors = state.get_neighbors()
+        else:
+            #layers are the pr value the node was expanded at
+            stats.expand(min(pr_forward, pr_backward), len(opened[0]) + len(opened[1]), len(closed[0]) + len(closed[1]))
+            start_time = time.perf_counter()
+            neighbors = state.get_neighbors()
+            stats.expansion_time += time.perf_counter() - start_time
+            stats.generated += len(neighbors)
+        for neighbor in neighbors:
+            known = opened[direction].get(neighbor.code) or closed[direction].get(neighbor.code)
+            if known is not None and known.depth <= neighbor.depth:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            closed[direction].pop(neighbor.code, None)
+            push(direction, neighbor)
+            match = opened[other].get(neighbor.code) or closed[other].get(neighbor.code)
+            if match is not None and neighbor.depth + match.depth < best_cost:
+                best_cost = neighbor.depth + match.depth
+                meeting = (neighbor, match) if direction == 0 else (match, neighbor)
+        iterations += 1
+    if meeting is None:
+        return None, None
+    return _join_paths(*meeting), iterations
+
+
+###########################################################
+###   ANYTIME WEIGHTED A* IMPLEMENTATION   ################
+###########################################################
+
+# Anytime Repairing A* (ARA*): weighted A* with f = g + w * h finds a first solution quickly,
+# then the weight is lowered and the search resumed, reusing everything found so far, until
+# w = 1 proves the solution optimal or the deadline runs out. Boards improved after they were
+# expanded wait in an inconsistent list instead of being expanded again with the same weight.
+
+def anytime_astar(initial_state, deadline=100, weights=(3, 2, 1.5, 1.25, 1), heuristic_fn=None, report=None, stats=None):
+    """Returns the best solution found within deadline milliseconds, improving it with every
+    lower weight. The solution returned is at most bound times longer than an optimal one, where
+    bound is the lower of the last weight completed and cost / min(g + h) over the boards still waiting.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        deadline (int, optional): wall clock budget in milliseconds. Defaults to 100.
+        weights (tuple, optional): decreasing heuristic weights, ending in 1. Defaults to (3, 2, 1.5, 1.25, 1).
+        heuristic_fn (_type_, optional): admissible heuristic, a name in HEURISTICS or called as heuristic_fn(state).
+            Defaults to None (manhattan).
+        report (_type_, optional): dict filled in with the cost, the proven bound, the last weight completed,
+            whether the solution is optimal and every improvement as {time, moves, bound}. Defaults to None.
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
+
+    Returns:
+        _type_: path and number of iterations, (None, None) if the deadline ran out before any solution
+    """
+    search_start = time.perf_counter()
+    stop_time = search_start + deadline / 1000
+    if report is None:
+        report = {}
+    report.update(cost=None, bound=None, weight=None, optimal=False, solutions=[])
+    if not is_solvable(initial_state):
+        return None, 0
+    heuristic_fn = _heuristic_for(heuristic_fn, initial_state.size) or heuristic
+
+    def estimate(state):
+        if stats is None:
+            return heuristic_fn(state)
+        start_time = time.perf_counter()
+        h = heuristic_fn(state)
+        stats.heuristic_time += time.perf_counter() - start_time
+        return h
+
+    #h of every board reached, the states waiting to be expanded and the ones improved after expansion
+    h = {initial_state.code: estimate(initial_state)}
+    best_g = {initial_state.code: 0}
+    open_states = {initial_state.code: initial_state}
+    inconsistent = {}
+    goal = initial_state if initial_state.is_goal() else None
+    completed_weight = float('inf')
+    iterations = 0
+    counter = 0
+
+    def proven_bound():
+        #every board on an optimal path that is not settled yet waits in open or inconsistent with its optimal g
+        lower = min((state.depth + h[code] for states in (open_states, inconsistent) for code, state in states.items()),
+                    default=goal.depth)
+        if lower >= goal.depth:
+            return 1.0
+        return min(completed_weight, goal.depth / lower)
+
+    def improved():
+        bound = proven_bound()
+        report['solutions'].append({
+            'time': time.perf_counter() - search_start,
+            'moves': goal.depth,
+            'bound': bound,
+        })
+        report.update(cost=goal.depth, bound=bound)
+
+    if goal is not None:
+        improved()
+    timed_out = False
+    for weight in weights:
+        if goal is not None and report['bound'] == 1.0:
+            break
+        #resume with the lower weight: everything waiting goes back on the queue, nothing is closed
+        open_states.update(inconsistent)
+        inconsistent = {}
+        closed = set()
+        frontier = []
+        if stats is not None:
+            start_time = time.perf_counter()
+        for code, state in open_states.items():
+            counter += 1
+            frontier.append((state.depth + weight * h[code], -state.depth, counter, state))
+        heapq.heapify(frontier)
+        if stats is not None:
+            stats.queue_time += time.perf_counter() - start_time
+        while frontier:
+            key, _, _, state = frontier[0]
+            #skip stale entries, the board was reached more cheaply after this was pushed
+            if open_states.get(state.code) is not state:
+                if stats is None:
+                    heapq.heappop(frontier)
+                else:
+                    start_time = time.perf_counter()
+                    heapq.heappop(frontier)
+                    stats.queue_time += time.perf_counter() - start_time
+                    stats.duplicates += 1
+                continue
+            #nothing left can improve the solution with this weight
+            if goal is not None and goal.depth <= key:
+                break
+            if not iterations & 63 and time.perf_counter() > stop_time:
+                timed_out = True
+                break
+            if stats is None:
+                heapq.heappop(frontier)
+            else:
+                start_time = time.perf_counter()
+                heapq.heappop(frontier)
+                stats.queue_time += time.perf_counter() - start_time
+            del open_states[state.code]
+            closed.add(state.code)
+            iterations += 1
+            if stats is None:
+                neighbors = state.get_neighbors()
+            else:
+                stats.expand(state.depth + h[state.code], len(open_states), len(closed))
+                start_time = time.perf_counter()
+                neighbors = state.get_neighbors()
+                stats.expansion_time += time.perf_counter() - start_time
+                stats.generated += len(neighbors)
+            for neighbor in neighbors:
+                if neighbor.depth >= best_g.get(neighbor.code, neighbor.depth + 1):
+                    if stats is not None:
+                        stats.duplicates += 1
+                    continue
+                best_g[neighbor.code] = neighbor.depth
+                if neighbor.code not in h:
+                    h[neighbor.code] = estimate(neighbor)
+                if neighbor.is_goal():
+                    goal = neighbor
+                if neighbor.code in closed:
+                    inconsistent[neighbor.code] = neighbor
+                else:
+                    open_states[neighbor.code] = neighbor
+                    counter += 1
+                    if stats is None:
+                        heapq.heappush(frontier, (neighbor.depth + weight * h[neighbor.code], -neighbor.depth, counter, neighbor))
+                    else:
+                        start_time = time.perf_counter()
+                        heapq.heappush(frontier, (neighbor.depth + weight * h[neighbor.code], -neighbor.depth, counter, neighbor))
+                        stats.queue_time += time.perf_counter() - start_time
+                if neighbor is goal:
+                    improved()
+        if timed_out:
+            break
+        completed_weight = weight
+        if goal is not None:
+            report['bound'] = proven_bound()
+    if goal is None:
+        return None, None
+    report.update(weight=None if completed_weight == float('inf') else completed_weight, optimal=report['bound'] == 1.0)
+    return goal.get_path(), iterations
+
+
+###########################################################
+###   SOLUTION CACHE   ####################################
+###########################################################
+
+class SolutionCache:
+    def __init__(self, capacity=100000, path=None):
+        """Remembers the exact distance to the goal of every board on the optimal paths
+        astar() returns, together with the moves that get there. Later searches that
+        reach one of those boards can stop there. The least recently used boards are
+        dropped once `capacity` is reached.
+
+        Args:
+            capacity (int, optional): most boards kept. Defaults to 100000.
+            path (_type_, optional): file to load from now and save() to later. Defaults to None.
+        """
+        from collections import OrderedDict
+
+        self.capacity = capacity
+        self.path = path
+        #packed board -> (moves left, the moves left packed 2 bits each with the last move lowest)
+        self.entries = OrderedDict()
+        #searches finished from the cache, and searches that had to reach the goal themselves
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            with open(path) as file:
+                for code, distance, moves in json.load(file):
+                    self.entries[code] = (distance, moves)
+            #the file may come from a bigger cache, it is saved oldest first
+            self._evict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, code):
+        entry = self.entries.get(code)
+        if entry is not None:
+            self.entries.move_to_end(code)
+        return entry
+
+    def finish(self, state, distance, moves):
+        #play the cached moves from `state` to reach the goal
+        for step in range(distance - 1, -1, -1):
+            state = state.slide((moves >> (2 * step)) & 3)
+        return state
+
+    def record(self, goal_state, hit=False):
+        """Stores every board on an optimal path. The moves left from the board at
+        depth d are just the lowest 2 * (depth - d) bits of the goal state's moves.
+
+        Args:
+            goal_state (_type_): goal state reached by an optimal search
+            hit (bool, optional): the search was finished from the cache. Defaults to False.
+        """
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        for state in goal_state.iter_path():
+            distance = goal_state.depth - state.depth
+            #the goal itself needs no entry, reaching it ends the search anyway
+            if distance == 0:
+                break
+            self.entries[state.code] = (distance, goal_state.moves & ((1 << (2 * distance)) - 1))
+            self.entries.move_to_end(state.code)
+        self._evict()
+
+    def _evict(self):
+        #drop the least recently used boards until the cache fits its capacity
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def save(self, path=None):
+        """Writes the cache as JSON, least recently used boards first. The file is
+        replaced in one step, so an interrupted save keeps the previous one.
+
+        Args:
+            path (_type_, optional): file to write. Defaults to the path given to the constructor.
+
+        Raises:
+            ValueError: neither save() nor the constructor was given a path
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("no file to save the cache to, pass a path here or to SolutionCache()")
+        entries = [[code, distance, moves] for code, (distance, moves) in self.entries.items()]
+        _replace_file(path, [json.dumps(entries).encode()])
+
+
+###########################################################
+###   VECTORISED BATCH OPERATIONS   #######################
+###########################################################
+
+# Boards as rows of a uint8 numpy array (one column per cell) so heuristics and successors
+# are computed for a whole batch with array operations instead of one board at a time.
+# The linear conflict tables are the same ones the HEURISTICS registry uses.
+# numpy is optional and only imported when one of these functions is used.
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("the vectorised batch functions need numpy (pip install numpy)") from None
+    return numpy
+
+_array_tables = {}
+
+def _tables_for(size):
+    #numpy versions of the move and heuristic tables, built once per board size
+    if size not in _array_tables:
+        if size > 4:
+            raise ValueError("the batch functions pack boards into 64 bits, up to 4x4")
+        np = _numpy()
+        cells = size * size
+        index = np.arange(cells)
+        tiles = np.arange(cells)
+        #goal cell of every tile, the empty tile is never counted
+        goal = np.where(tiles == 0, cells - 1, tiles - 1)
+        move_target = np.zeros((cells, 4), dtype=np.intp)
+        move_valid = np.zeros((cells, 4), dtype=bool)
+        for cell in range(cells):
+            x, y = divmod(cell, size)
+            for move, (dx, dy) in enumerate([(-1, 0), (1, 0), (0, -1), (0, 1)]):
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    move_target[cell, move] = size * (x + dx) + y + dy
+                    move_valid[cell, move] = True
+        costs, lines = linear_conflict_tables(size)
+        _array_tables[size] = {
+            'cells': cells,
+            'cell_row': index // size,
+            'cell_col': index % size,
+            'goal_row': goal // size,
+            'goal_col': goal % size,
+            'move_target': move_target,
+            'move_valid': move_valid,
+            'shifts': (np.arange(cells) * TILE_BITS).astype(np.uint64),
+            'line_costs': np.frombuffer(bytes(costs), dtype=np.uint8),
+            'lines': [(np.array(line_cells), np.frombuffer(bytes(digits), dtype=np.uint8).astype(np.int64))
+                      for line_cells, digits in lines],
+            'weights': (size + 1) ** np.arange(size, dtype=np.int64),
+        }
+    return _array_tables[size]
+
+def _array_width(boards, size):
+    #the width of the boards in an array is known from its number of columns, like a
+    #PuzzleState knows it from its geometry
+    return size or round(boards.shape[1] ** 0.5)
+
+def boards_to_array(boards, size=None):
+    """Stacks boards into a (boards, cells) uint8 array.
+
+    Args:
+        boards (_type_): PuzzleStates, packed ints or list of lists boards
+        size (_type_, optional): width of the board. Defaults to None (that of the first board,
+            SIZE for packed ints, which do not carry it).
+
+    Returns:
+        _type_: numpy array, one board per row
+    """
+    np = _numpy()
+    boards = list(boards)
+    if size is None:
+        first = boards[0] if boards else None
+        size = first.size if isinstance(first, PuzzleState) else len(first) if isinstance(first, list) else SIZE
+    codes = [board.code if isinstance(board, PuzzleState) else board if isinstance(board, int) else pack_board(board)
+             for board in boards]
+    return codes_to_array(np.array(codes, dtype=np.uint64), size)
+
+def codes_to_array(codes, size=SIZE):
+    #packed codes do not carry their width, so it has to be given for anything but 3x3
+    tables = _tables_for(size)
+    return ((codes[:, None] >> tables['shifts']) & TILE_MASK).astype(_numpy().uint8)
+
+def array_to_codes(boards, size=None):
+    tables = _tables_for(_array_width(boards, size))
+    return (boards.astype(_numpy().uint64) << tables['shifts']).sum(axis=1)
+
+def batch_manhattan(boards, size=None):
+    """Manhattan distance of every row of a board array at once.
+
+    Args:
+        boards (_type_): (boards, cells) uint8 array
+        size (_type_, optional): width of the board. Defaults to None (from the number of columns).
+
+    Returns:
+        _type_: int array with one distance per board
+    """
+    np = _numpy()
+    tables = _tables_for(_array_width(boards, size))
+    distance = np.abs(tables['goal_row'][boards] - tables['cell_row']) + np.abs(tables['goal_col'][boards] - tables['cell_col'])
+    distance[boards == 0] = 0
+    return distance.sum(axis=1)
+
+def batch_linear_conflict(boards, size=None):
+    """Manhattan distance plus linear conflicts of every row of a board array at once,
+    one table lookup per row and column of the boards.
+
+    Args:
+        boards (_type_): (boards, cells) uint8 array
+        size (_type_, optional): width of the board. Defaults to None (from the number of columns).
+
+    Returns:
+        _type_: int array with one estimate per board
+    """
+    size = _array_width(boards, size)
+    tables = _tables_for(size)
+    total = batch_manhattan(boards, size)
+    for line_cells, digits in tables['lines']:
+        total = total + tables['line_costs'][digits[boards[:, line_cells]] @ tables['weights']]
+    return total
+
+BATCH_HEURISTICS = {
+    "manhattan": batch_manhattan,
+    "linear_conflict": batch_linear_conflict,
+}
+
+def batch_neighbors(boards, empty, size=None):
+    """Every successor of every board in a batch.
+
+    Args:
+        boards (_type_): (boards, cells) uint8 array
+        empty (_type_): int array, the empty cell of each board
+        size (_type_, optional): width of the board. Defaults to None (from the number of columns).
+
+    Returns:
+        _type_: (children array, index of each child's parent, move code, new empty cell)
+    """
+    np = _numpy()
+    tables = _tables_for(_array_width(boards, size))
+    parent = np.repeat(np.arange(len(boards)), 4)
+    move = np.tile(np.arange(4), len(boards))
+    empty = np.repeat(np.asarray(empty), 4)
+    valid = tables['move_valid'][empty, move]
+    parent, move, empty = parent[valid], move[valid], empty[valid]
+    target = tables['move_target'][empty, move]
+    children = boards[parent]
+    rows = np.arange(len(children))
+    children[rows, empty] = children[rows, target]
+    children[rows, target] = 0
+    return children, parent, move, target
+
+def score_boards(boards, heuristic="manhattan", size=None):
+    """Scores a large set of boards with one of the BATCH_HEURISTICS.
+
+    Args:
+        boards (_type_): (boards, cells) array, or anything boards_to_array() takes
+        heuristic (str, optional): key of BATCH_HEURISTICS. Defaults to "manhattan".
+        size (_type_, optional): width of the board. Defaults to None (from the boards).
+
+    Returns:
+        _type_: int array with one estimate per board
+    """
+    np = _numpy()
+    if not isinstance(boards, np.ndarray):
+        boards = boards_to_array(boards, size)
+    return BATCH_HEURISTICS[heuristic](boards, size)
+
+def batch_astar(initial_state, heuristic_fn="linear_conflict", batch_size=64, stats=None):
+    """A* that pops up to batch_size states sharing the lowest f and expands them together:
+    successors, packed boards and heuristics come from array operations over the batch,
+    only duplicate detection and the queue stay per state. Every state popped has the
+    same minimal f, so a goal among them is still optimal.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        heuristic_fn (str, optional): key of BATCH_HEURISTICS, named like the other solvers' heuristic_fn.
+            Defaults to "linear_conflict", None means manhattan.
+        batch_size (int, optional): most states expanded together. Defaults to 64.
+        stats (_type_, optional): a SearchStats to record into. Defaults to None (no instrumentation).
+
+    Returns:
+        _type_: optimal path and number of iterations
+    """
+    heuristic_fn = heuristic_fn or "manhattan"
+    if heuristic_fn not in BATCH_HEURISTICS:
+        raise ValueError(f"batch_astar takes one of {sorted(BATCH_HEURISTICS)}, not {heuristic_fn!r}")
+    if not is_solvable(initial_state):
+        return None, 0
+    np = _numpy()
+    geometry = initial_state.geometry
+    size = geometry.size
+    batch_heuristic = BATCH_HEURISTICS[heuristic_fn]
+    frontier = BucketQueue()
+    frontier.push(int(batch_heuristic(boards_to_array([initial_state], size), size)[0]), 0, initial_state)
+    best_g = {initial_state.code: 0}
+    iterations = 0
+    while frontier and iterations <= MAX_ITERATION:
+        #every live state with the current lowest f, up to batch_size of them
+        f = frontier.peek()
+        batch = []
+        while frontier and len(batch) < batch_size and frontier.peek() == f:
+            _, g, state = frontier.pop()
+            if g > best_g[state.code]:
+                continue
+            if state.is_goal():
+                return state.get_path(), iterations
+            batch.append(state)
+        if not batch:
+            continue
+        if stats is not None:
+            for state in batch:
+                stats.expand(f, len(frontier), len(best_g) - len(frontier))
+            start_time = time.perf_counter()
+        parents = codes_to_array(np.array([state.code for state in batch], dtype=np.uint64), size)
+        children, parent_index, moves, targets = batch_neighbors(parents, [state.empty_index for state in batch], size)
+        codes = array_to_codes(children, size).tolist()
+        if stats is not None:
+            stats.expansion_time += time.perf_counter() - start_time
+            stats.generated += len(codes)
+            start_time = time.perf_counter()
+        manhattan = batch_manhattan(children, size).tolist()
+        estimates = manhattan if heuristic_fn == "manhattan" else batch_heuristic(children, size).tolist()
+        if stats is not None:
+            stats.heuristic_time += time.perf_counter() - start_time
+        for code, parent, move, target, h, estimate in zip(codes, parent_index.tolist(), moves.tolist(),
+                                                           targets.tolist(), manhattan, estimates):
+            state = batch[parent]
+            g = state.depth + 1
+            if g < best_g.get(code, g + 1):
+                best_g[code] = g
+                frontier.push(g + estimate, g, PuzzleState(code, target, g, (state.moves << 2) | move, h, geometry))
+            elif stats is not None:
+                stats.duplicates += 1
+        iterations += len(batch)
+    return None, None
+
+
+###########################################################
+###   HASH DISTRIBUTED A* (HDA*)   ########################
+###########################################################
+
+# Every board is owned by one worker process, picked by hashing its packed code. A worker
+# keeps the open and closed lists of its own boards only, and sends every board it generates
+# for another worker to that owner in batches. The cost of the best solution found so far is
+# shared; workers keep searching below it until no worker has anything left under it and no
+# batch is still on its way, so the solution returned is optimal.
+#
+# Termination uses two probe waves (Mattern's four counter method): each worker answers with
+# whether it is idle and how many batches it has sent and received. Everyone idle with sent ==
+# received in two waves in a row, with the same totals, means nothing was in flight in between.
+
+def _hda_owner(code, workers):
+    #fibonacci hashing, spreads neighbouring codes over all the workers
+    return (((code * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % workers
+
+def _hda_worker(rank, workers, inboxes, results, bound, batch_size, size, heuristic_fn, timed=False):
+    from queue import Empty
+
+    geometry = board_geometry(size)
+    estimate = _heuristic_for(heuristic_fn, size) or heuristic
+    inbox = inboxes[rank]
+    frontier = BucketQueue()
+    best_g = {}
+    buffers = [[] for _ in range(workers)]
+    counts = {'expanded': 0, 'generated': 0, 'sent': 0, 'received': 0, 'nodes_sent': 0, 'busy_time': 0.0,
+              'expansion_time': 0.0, 'heuristic_time': 0.0, 'queue_time': 0.0}
+
+    def send(owner):
+        inboxes[owner].put(("nodes", buffers[owner]))
+        counts['sent'] += 1
+        counts['nodes_sent'] += len(buffers[owner])
+        buffers[owner] = []
+
+    def accept(code, empty_index, depth, moves, h, estimate):
+        #h is the manhattan distance the state carries, estimate the heuristic's value
+        if depth + estimate < bound.value and depth < best_g.get(code, depth + 1):
+            best_g[code] = depth
+            if not timed:
+                frontier.push(depth + estimate, depth, PuzzleState(code, empty_index, depth, moves, h, geometry))
+                return
+            step_time = time.perf_counter()
+            frontier.push(depth + estimate, depth, PuzzleState(code, empty_index, depth, moves, h, geometry))
+            counts['queue_time'] += time.perf_counter() - step_time
+
+    while True:
+        #everything left costs at least as much as the best solution found, drop it
+        if frontier and frontier.peek() >= bound.value:
+            frontier = BucketQueue()
+        if not frontier:
+            for owner in range(workers):
+                if buffers[owner]:
+                    send(owner)
+        try:
+            #block for work when there is nothing to expand, otherwise just check the inbox
+            message = inbox.get(block=not frontier)
+        except Empty:
+            message = None
+        if message is not None:
+            if message[0] == "nodes":
+                counts['received'] += 1
+                for node in message[1]:
+                    accept(*node)
+            elif message[0] == "probe":
+                results.put(("probe", message[1], rank, not frontier, counts['sent'], counts['received']))
+            else:
+                results.put(("done", rank, counts))
+                return
+            continue
+
+        start_time = time.perf_counter()
+        for _ in range(batch_size):
+            if not frontier:
+                break
+            if not timed:
+                f, g, state = frontier.pop()
+            else:
+                step_time = time.perf_counter()
+                f, g, state = frontier.pop()
+                counts['queue_time'] += time.perf_counter() - step_time
+            if g > best_g[state.code]:
+                continue
+            if f >= bound.value:
+                frontier = BucketQueue()
+                break
+            if state.is_goal():
+                with bound.get_lock():
+                    if g < bound.value:
+                        bound.value = g
+                        results.put(("goal", g, state.empty_index, state.moves))
+                continue
+            counts['expanded'] += 1
+            if not timed:
+                neighbors = state.get_neighbors()
+            else:
+                step_time = time.perf_counter()
+                neighbors = state.get_neighbors()
+                counts['expansion_time'] += time.perf_counter() - step_time
+            counts['generated'] += len(neighbors)
+            for neighbor in neighbors:
+                owner = _hda_owner(neighbor.code, workers)
+                if not timed:
+                    value = estimate(neighbor)
+                else:
+                    step_time = time.perf_counter()
+                    value = estimate(neighbor)
+                    counts['heuristic_time'] += time.perf_counter() - step_time
+                node = (neighbor.code, neighbor.empty_index, neighbor.depth, neighbor.moves, neighbor.h, value)
+                if owner == rank:
+                    accept(*node)
+                else:
+                    buffers[owner].append(node)
+                    if len(buffers[owner]) >= batch_size:
+                        send(owner)
+        counts['busy_time'] += time.perf_counter() - start_time
+
+def _hda_process(rank, workers, inboxes, results, *search):
+    #a worker that fails tells the coordinator why instead of leaving it waiting for replies
+    try:
+        _hda_worker(rank, workers, inboxes, results, *search)
+    except Exception as error:
+        results.put(("error", rank, f"{type(error).__name__}: {error}"))
+        raise
+
+def hda_astar(initial_state, workers=None, batch_size=64, heuristic_fn=None, report=None, stats=None):
+    """Hash distributed A*, an optimal A* spread over worker processes, see the notes above.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        workers (_type_, optional): number of processes. Defaults to os.cpu_count().
+        batch_size (int, optional): boards sent to another worker at a time, and expanded between
+            checks of the inbox. Defaults to 64.
+        heuristic_fn (_type_, optional): admissible heuristic, a name in HEURISTICS or called as heuristic_fn(state),
+            evaluated by the worker that generates each board. Defaults to None (manhattan).
+        report (_type_, optional): dict filled in with the time and, for every worker, the boards it
+            expanded, its share of the work and the fraction of the time it was busy. Defaults to None.
+        stats (_type_, optional): a SearchStats, gets the expanded and generated totals and the time split,
+            summed over the workers (CPU seconds, not wall time). Defaults to None.
+
+    Returns:
+        _type_: optimal path and number of boards expanded over all workers
+
+    Raises:
+        RuntimeError: a worker raised or died, the others are stopped first
+    """
+    import multiprocessing
+    from queue import Empty
+
+    if not is_solvable(initial_state):
+        return None, 0
+    workers = workers or os.cpu_count()
+    start_time = time.perf_counter()
+    #estimated here before any process starts, so a heuristic that fails does so right away
+    estimate = (_heuristic_for(heuristic_fn, initial_state.size) or heuristic)(initial_state)
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+    #cost of the best solution found so far, shared by every worker
+    bound = context.Value('i', 1 << 30)
+    processes = [context.Process(target=_hda_process, daemon=True,
+                                 args=(rank, workers, inboxes, results, bound, batch_size, initial_state.size, heuristic_fn,
+                                       stats is not None))
+                 for rank in range(workers)]
+    for process in processes:
+        process.start()
+    inboxes[_hda_owner(initial_state.code, workers)].put(
+        ("nodes", [(initial_state.code, initial_state.empty_index, 0, 0, initial_state.h, estimate)]))
+
+    def receive():
+        #waits for the next message, checking now and then that no worker has died without one
+        while True:
+            try:
+                message = results.get(timeout=0.1)
+            except Empty:
+                for rank, process in enumerate(processes):
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(f"HDA* worker {rank} died with exit code {process.exitcode}") from None
+                continue
+            if message[0] == "error":
+                raise RuntimeError(f"HDA* worker {message[1]} failed: {message[2]}")
+            return message
+
+    goal = None
+    finished = {}
+    try:
+        #the batch sent above counts as sent by nobody
+        previous = None
+        wave = 0
+        while True:
+            wave += 1
+            for inbox in inboxes:
+                inbox.put(("probe", wave))
+            replies = 0
+            idle = True
+            sent = 1
+            received = 0
+            while replies < workers:
+                message = receive()
+                if message[0] == "goal":
+                    if goal is None or message[1] < goal.depth:
+                        goal = PuzzleState(initial_state.geometry.goal_code, message[2], message[1], message[3], 0,
+                                           initial_state.geometry)
+                elif message[1] == wave:
+                    replies += 1
+                    idle = idle and message[3]
+                    sent += message[4]
+                    received += message[5]
+            totals = (sent, received) if idle and sent == received else None
+            if totals is not None and totals == previous:
+                break
+            previous = totals
+            if totals is None:
+                time.sleep(0.001)
+        for inbox in inboxes:
+            inbox.put(("stop",))
+        while len(finished) < workers:
+            message = receive()
+            if message[0] == "done":
+                finished[message[1]] = message[2]
+    except BaseException:
+        #the others are blocked waiting for work that will never come
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+    elapsed_time = time.perf_counter() - start_time
+
+    counts = [finished[rank] for rank in range(workers)]
+    expanded = sum(count['expanded'] for count in counts)
+    if stats is not None:
+        stats.expanded += expanded
+        stats.generated += sum(count['generated'] for count in counts)
+        stats.expansion_time += sum(count['expansion_time'] for count in counts)
+        stats.heuristic_time += sum(count['heuristic_time'] for count in counts)
+        stats.queue_time += sum(count['queue_time'] for count in counts)
+    if report is not None:
+        report.update({
+            'workers': workers,
+            'time': elapsed_time,
+            'expanded': expanded,
+            'per_worker': [{
+                'expanded': count['expanded'],
+                'share': count['expanded'] * workers / expanded if expanded else 0.0,
+                'busy': count['busy_time'] / elapsed_time if elapsed_time else 0.0,
+                'batches_sent': count['sent'],
+                'nodes_sent': count['nodes_sent'],
+            } for count in counts],
+        })
+    if goal is None:
+        return None, None
+    return goal.get_path(), expanded
+
+def hda_scaling(initial_state, worker_counts=(1, 2, 4), batch_size=64):
+    """Runs hda_astar() with each number of workers against plain astar() on one board.
+
+    Args:
+        initial_state (_type_): Takes the intial state of the board as a parameter
+        worker_counts (tuple, optional): numbers of workers to try. Defaults to (1, 2, 4).
+        batch_size (int, optional): passed on to hda_astar(). Defaults to 64.
+
+    Returns:
+        _type_: one dict per worker count with the time, speedup over astar(), scaling efficiency
+            (speedup / workers), search overhead (expanded / astar expanded) and the per worker report
+    """
+    start_time = time.perf_counter()
+    stats = SearchStats()
+    astar(initial_state, stats=stats)
+    serial_time = time.perf_counter() - start_time
+    rows = []
+    for workers in worker_counts:
+        report = {}
+        hda_astar(initial_state, workers, batch_size, report=report)
+        speedup = serial_time / report['time']
+        report.update({
+            'speedup': speedup,
+            'efficiency': speedup / workers,
+            'search_overhead': report['expanded'] / stats.expanded if stats.expanded else 1.0,
+        })
+        rows.append(report)
+    return rows
+
+
+###########################################################
+###   SOLVE FACADE   ######################################
+###########################################################
+
+SOLVERS = {
+    "bfs": bfs,
+    "dfs": dfs,
+    "astar": astar,
+    "greedy": greedy_best_first,
+    "ids": ids,
+    "idastar": idastar,
+    "oracle": oracle_solve,
+    "external_bfs": external_bfs,
+    "anytime": anytime_astar,
+    "hda": hda_astar,
+    "batch_astar": batch_astar,
+}
+
+#the SOLVERS that take heuristic_fn, the rest are uninformed
+INFORMED_SOLVERS = ("astar", "greedy", "idastar", "anytime", "hda", "batch_astar")
+
+def solve(board, algorithm="astar", **options):
+    """Runs one of the SOLVERS on a board and reports how it went.
+
+    Args:
+        board (_type_): PuzzleState or list of lists board
+        algorithm (str, optional): key of SOLVERS. Defaults to "astar".
+        **options: passed on to the solver, e.g. max_depth for ids or stats for a SearchStats
+
+    Returns:
+        _type_: dict with the status ("solved", "unsolvable" or "failed" when the
+            iteration limit ran out), the path, number of moves, iterations and time
+    """
+    if options.get('heuristic_fn') is not None and algorithm not in INFORMED_SOLVERS:
+        raise ValueError(f"{algorithm} is an uninformed search and takes no heuristic")
+    state = board if isinstance(board, PuzzleState) else state_from_board(board)
+    stats = options.get('stats')
+    start_time = time.perf_counter()
+    #the stats stop their clock and memory tracing even when the solver raises
+    with stats if stats is not None else nullcontext():
+        if is_solvable(state):
+            path, iterations = SOLVERS[algorithm](state, **options)
+        else:
+            path, iterations = None, 0
+    elapsed_time = time.perf_counter() - start_time
+    if path:
+        status = "solved"
+    elif iterations == 0:
+        status = "unsolvable"
+    else:
+        status = "failed"
+    return {
+        'algorithm': algorithm,
+        'status': status,
+        'path': path,
+        'moves': len(path) - 1 if path else None,
+        'iterations': iterations,
+        'time': elapsed_time,
+    }
+
+
+###########################################################
+###   BATCH SOLVE   #######################################
+###########################################################
+
+def _init_solve_worker(algorithm, heuristic_fn=None, sizes=()):
+    #build or map the shared tables once per worker process. Forked workers inherit whatever
+    #the parent built before the pool started, and files are mapped read-only, so every worker
+    #shares the same pages of the OS page cache instead of holding a copy
+    if algorithm == "oracle":
+        distance_oracle()
+    for size in sizes:
+        #a heuristic that cannot be built for this width is left for solve() to report per board
+        try:
+            if algorithm == "batch_astar":
+                _tables_for(size)
+            elif isinstance(heuristic_fn, str):
+                get_heuristic(heuristic_fn, size)
+        except (ValueError, OSError, ImportError):
+            pass
+
+def _solve_chunk(jobs, algorithm, options):
+    results = []
+    for index, board in jobs:
+        #one board the solver cannot take must not lose the rest of the chunk or stream
+        try:
+            result = solve(board, algorithm, **options)
+        except Exception as error:
+            result = {'algorithm': algorithm, 'status': "error", 'path': None, 'error': f"{type(error).__name__}: {error}"}
+        path = result.pop('path')
+        result['index'] = index
+        result['board'] = board
+        result['solution'] = path[-1].get_moves() if path else None
+        results.append(result)
+    return results
+
+def solve_many(boards, algorithm="astar", workers=None, chunksize=8, report=None, **options):
+    """Solves many independent boards on a pool of worker processes and yields each
+    result as soon as its chunk finishes, so results come back out of order (use
+    result['index']). Only a few chunks per worker are in flight at once, which keeps
+    memory bounded however long `boards` is.
+
+    Args:
+        boards (_type_): iterable of list of lists boards
+        algorithm (str, optional): key of SOLVERS. Defaults to "astar".
+        workers (_type_, optional): number of processes. Defaults to os.cpu_count().
+        chunksize (int, optional): boards sent to a worker at a time. Defaults to 8.
+        report (_type_, optional): dict that is filled with the totals and throughput once every board is done
+        **options: passed on to the solver
+
+    Yields:
+        _type_: solve() dicts with the path replaced by 'solution' (see PuzzleState.get_moves())
+            plus the board and its 'index' in `boards`. A board the solver raised on gets
+            status "error" and the exception in 'error' instead
+    """
+    #only needed here, so importing this module does not pull in multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from itertools import chain
+
+    workers = workers or os.cpu_count()
+    #build the tables here once, for the width of the first board, rather than in every worker
+    #or racing to write the same file
+    boards = iter(boards)
+    first = next(boards, None)
+    sizes = () if first is None else (len(first),)
+    boards = chain([first], boards) if first is not None else boards
+    initargs = (algorithm, options.get('heuristic_fn'), sizes)
+    _init_solve_worker(*initargs)
+    boards = enumerate(boards)
+    start_time = time.perf_counter()
+    solved = 0
+    total = 0
+    with ProcessPoolExecutor(workers, initializer=_init_solve_worker, initargs=initargs) as pool:
+        pending = set()
+
+        def submit():
+            jobs = [job for _, job in zip(range(chunksize), boards)]
+            if jobs:
+                pending.add(pool.submit(_solve_chunk, jobs, algorithm, options))
+
+        for _ in range(2 * workers):
+            submit()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                submit()
+                for result in future.result():
+                    total += 1
+                    if result['status'] == "solved":
+                        solved += 1
+                    yield result
+    elapsed_time = time.perf_counter() - start_time
+    if report is not None:
+        report.update({
+            'algorithm': algorithm,
+            'workers': workers,
+            'boards': total,
+            'solved': solved,
+            'time': elapsed_time,
+            'boards_per_second': total / elapsed_time if elapsed_time else 0.0,
+        })
+
+
+###########################################################
+###   COMMAND LINE   ######################################
+###########################################################
+
+def parse_board(line):
+    """Reads one board from a line of JSON, either nested rows [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    or flat [1, 2, 3, 4, 5, 6, 7, 8, 0]. Any width from 2x2 to 5x5 is accepted.
+
+    Args:
+        line (_type_): the text of the line
+
+    Returns:
+        _type_: list of lists board
+
+    Raises:
+        ValueError: the line is not JSON, or not a board (anything but a list of lists of ints)
+    """
+    board = json.loads(line)
+    #type() rather than isinstance() so true, false and 1.0 are not taken for tiles
+    if isinstance(board, list) and board and all(type(tile) is int for tile in board):
+        size = int(len(board) ** 0.5)
+        board = [board[i:i + size] for i in range(0, len(board), size)]
+    if not isinstance(board, list) or not 2 <= len(board) <= 5 \
+            or any(not isinstance(row, list) or len(row) != len(board) or any(type(tile) is not int for tile in row)
+                   for row in board) \
+            or sorted(tile for row in board for tile in row) != list(range(len(board) ** 2)):
+        raise ValueError("not a square board from 2x2 to 5x5 with tiles 0 to width * width - 1")
+    return board
+
+def read_boards(lines):
+    #boards from an iterable of lines, one at a time; bad lines are reported on stderr and skipped
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield parse_board(line)
+        except ValueError as error:
+            print(f"line {number}: {error}", file=sys.stderr)
+
+def solve_stream(lines, output, algorithm="astar", workers=1, **options):
+    """Solves boards read from `lines` and writes one JSON result per line to `output`
+    as each one finishes. Boards are read lazily and nothing is kept after it has been
+    written, so memory stays bounded however long the input is. With more than one
+    worker the boards are spread over solve_many() and results may come out of order.
+    A line that is not a board is reported on stderr and skipped, and a board the solver
+    raises on is written with status "error", so one bad board never ends the stream.
+
+    Args:
+        lines (_type_): iterable of lines, e.g. an open file or sys.stdin
+        output (_type_): writable text stream
+        algorithm (str, optional): key of SOLVERS. Defaults to "astar".
+        workers (int, optional): number of processes. Defaults to 1 (no pool).
+        **options: passed on to the solver, e.g. heuristic_fn
+    """
+    boards = read_boards(lines)
+    if workers > 1:
+        results = solve_many(boards, algorithm, workers=workers, **options)
+    else:
+        results = (_solve_chunk([(index, board)], algorithm, options)[0] for index, board in enumerate(boards))
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+
+
+###########################################################
+###   BENCHMARK   #########################################
+###########################################################
 
 initial_boards = [
     [[1, 2, 3], [4, 5, 6], [7, 0, 8]],  # Test Case 1
@@ -446,86 +3115,186 @@ initial_boards = [
     [[8, 6, 7], [2, 5, 4], [3, 0, 1]]   # Test Case 10
 ]
 
+#15-puzzle boards that plain A* still solves within MAX_ITERATION, to compare against the 3x3 path
+initial_boards_4x4 = [
+    [[2, 7, 8, 0], [5, 6, 4, 3], [1, 9, 10, 11], [13, 14, 15, 12]],
+    [[1, 2, 0, 3], [9, 6, 14, 4], [5, 7, 12, 8], [13, 15, 11, 10]],
+    [[2, 7, 3, 6], [1, 9, 4, 8], [10, 13, 15, 11], [5, 14, 0, 12]],
+    [[6, 1, 3, 4], [12, 0, 8, 15], [14, 2, 7, 11], [10, 5, 9, 13]],
+    [[1, 2, 4, 7], [6, 9, 3, 0], [5, 14, 10, 12], [13, 15, 11, 8]],
+]
 
+#(label, key of SOLVERS, options)
+benchmark_algorithms = [
+    ("BFS", "bfs", {}),
+    ("DFS", "dfs", {}),
+    ("A*", "astar", {}),
+    ("Greedy Best-First", "greedy", {}),
+    ("IDS", "ids", {"max_depth": 100}),
+    ("IDA*", "idastar", {}),
+    ("Bidirectional BFS", "bfs", {"bidirectional": True}),
+    ("External Memory BFS", "external_bfs", {}),
+    ("Bidirectional A*", "astar", {"bidirectional": True}),
+    ("Anytime A* (20 ms)", "anytime", {"deadline": 20, "report": {}}),
+]
 
-for board in initial_boards:
-    empty_tile = [(i, j) for i in range(3) for j in range(3) if board[i][j] == 0][0]
-    initial_state = PuzzleState(board, empty_tile)
-    print("Testing board:")
-    print_board(initial_state)
+def size_benchmark(algorithms=(("astar", {}), ("idastar", {"max_iterations": 1000000}))):
+    """Compares the 4x4 boards with the 3x3 ones on the same code path.
 
-    #run BFS
-    print("BFS Solution:")
-    start_time = time.time()
-    path, iterations = bfs(initial_state)
-    end_time = time.time()
+    Args:
+        algorithms (tuple, optional): (key of SOLVERS, options) pairs to run. Defaults to A* and IDA*
+            (without its iteration limit, so every 3x3 test board counts).
 
-    # for state in path:
-    #     print_board(state)
-    print(f"Time taken: {end_time - start_time} seconds")
-    if(path):
-        print(f"Number of moves: {len(path) - 1}")
-        print(f"Number of iterations: {iterations}\n")
-    else:
-        print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
-
-    
-    
-    #RUN DFS
-    print("DFS Solution:")
-    start_time = time.time()
-    path, iterations = dfs(initial_state)
-    end_time = time.time()
-    # for state in path:
-    #     print_board(state)
-    print(f"Time taken: {end_time - start_time} seconds")
-    if(path):
-        print(f"Number of moves: {len(path) - 1}")
-        print(f"Number of iterations: {iterations}\n")
-    else:
-        print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
-    
-    
-    #RUN A*
-    print("A* Solution:")
-    start_time = time.time()
-    path, iterations = astar(initial_state)
-    end_time = time.time()
-    # for state in path:
-    #     print_board(state)
-    print(f"Time taken: {end_time - start_time} seconds")
-    if(path):
-        print(f"Number of moves: {len(path) - 1}")
-        print(f"Number of iterations: {iterations}\n")
-    else:
-        print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
-    
-    
-    #RUN GFS
-    print("Greedy Best-First Solution:")
-    start_time = time.time()
-    path, iterations = greedy_best_first(initial_state)
-    end_time = time.time()
-    # for state in path:
-    #     print_board(state)
-    print(f"Time taken: {end_time - start_time} seconds")
-    if(path):
-        print(f"Number of moves: {len(path) - 1}")
-        print(f"Number of iterations: {iterations}\n")
-    else:
-        print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
-    
-    
-    #RUN IDS
-    print("IDS Solution:")
-    start_time = time.time()
-    path, iterations = ids(initial_state, max_depth=100)
-    end_time = time.time()
-    # for state in path:
-    #     print_board(state)
-    print(f"Time taken: {end_time - start_time} seconds")
-    if(path):
-        print(f"Number of moves: {len(path) - 1}")
-        print(f"Number of iterations: {iterations}\n")
+    Returns:
+        _type_: one dict per (board width, algorithm) with the boards solved, total moves,
+            expansions and time, and expansions per second
+    """
+    rows = []
+    for size, boards in ((3, initial_boards), (4, initial_boards_4x4)):
+        states = [state_from_board(board) for board in boards]
+        states = [state for state in states if is_solvable(state)]
+        for algorithm, options in algorithms:
+            row = {'size': size, 'algorithm': algorithm, 'boards': 0, 'moves': 0, 'iterations': 0, 'time': 0.0}
+            for state in states:
+                result = solve(state, algorithm, **options)
+                if result['status'] == "solved":
+                    row['boards'] += 1
+                    row['moves'] += result['moves']
+                    row['iterations'] += result['iterations']
+                    row['time'] += result['time']
+            row['per_second'] = row['iterations'] / row['time'] if row['time'] else 0.0
+            rows.append(row)
+    return rows
+
+def heuristic_benchmark(names=("manhattan", "linear_conflict", "walking_distance",
+                                "max(linear_conflict, walking_distance)")):
+    """Runs A* with each heuristic on the solvable test boards, to weigh the nodes a stronger
+    heuristic saves against the time it costs per node.
+
+    Args:
+        names (tuple, optional): heuristics to compare, the first is the baseline. Defaults to the registry's
+            manhattan, linear conflict, walking distance and the max of the last two.
+
+    Returns:
+        _type_: one dict per heuristic with the expansions and time over every board, and both as
+            a ratio of the baseline's
+    """
+    states = [state_from_board(board) for board in initial_boards]
+    states = [state for state in states if is_solvable(state)]
+    rows = []
+    for name in names:
+        #build the tables before timing anything
+        get_heuristic(name)
+        row = {'heuristic': name, 'iterations': 0, 'time': 0.0}
+        for state in states:
+            result = solve(state, "astar", heuristic_fn=name)
+            row['iterations'] += result['iterations']
+            row['time'] += result['time']
+        rows.append(row)
+    for row in rows:
+        row['node_reduction'] = rows[0]['iterations'] / row['iterations'] if row['iterations'] else 1.0
+        row['time_ratio'] = row['time'] / rows[0]['time'] if rows[0]['time'] else 1.0
+    return rows
+
+def run_benchmark():
+    """Runs every benchmark algorithm on every test board, then a parallel batch for throughput."""
+    for board in initial_boards:
+        initial_state = state_from_board(board)
+        print("Testing board:")
+        print_board(initial_state)
+
+        for label, algorithm, options in benchmark_algorithms:
+            print(f"{label} Solution:")
+            result = solve(initial_state, algorithm, **options)
+            print(f"Time taken: {result['time']} seconds")
+            if result['status'] == "solved":
+                print(f"Number of moves: {result['moves']}")
+                if "report" in options:
+                    print(f"Proven within: {options['report']['bound']:.3f} x optimal")
+                print(f"Number of iterations: {result['iterations']}\n")
+            elif result['status'] == "unsolvable":
+                print("Board is unsolvable, rejected before searching\n")
+            else:
+                print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
+
+    #solve every test board many times over in parallel to measure throughput
+    print("Batch A* Solution:")
+    batch_report = {}
+    for _ in solve_many(initial_boards * 100, "astar", report=batch_report):
+        pass
+    print(f"Solved {batch_report['solved']} of {batch_report['boards']} boards with {batch_report['workers']} workers")
+    print(f"Time taken: {batch_report['time']} seconds")
+    print(f"Throughput: {batch_report['boards_per_second']:.1f} boards per second\n")
+
+    print("Heuristic Comparison (A*):")
+    for row in heuristic_benchmark():
+        print(f"{row['heuristic']}: {row['iterations']} expansions in {row['time']:.3f} seconds, "
+              f"{row['node_reduction']:.2f}x fewer nodes than manhattan at {row['time_ratio']:.2f}x the time")
+    print()
+
+    #the same solvers on 15-puzzle boards, expansions per second should stay close to 3x3
+    print("Board Size Comparison:")
+    rows = size_benchmark()
+    for row in rows:
+        print(f"{row['size']}x{row['size']} {row['algorithm']}: {row['boards']} boards, {row['moves']} moves, "
+              f"{row['iterations']} expansions in {row['time']:.3f} seconds, {row['per_second']:.0f} per second")
+    for small, large in zip(rows[:len(rows) // 2], rows[len(rows) // 2:]):
+        if small['per_second']:
+            print(f"{large['algorithm']}: 4x4 expands at {large['per_second'] / small['per_second']:.2f}x the 3x3 rate")
+    print()
+
+    #distance of every solvable board from the goal, layer by layer on disk
+    histogram = depth_histogram()
+    print("Boards at each distance from the goal:")
+    print(", ".join(f"{depth}: {count}" for depth, count in enumerate(histogram)))
+    print(f"{sum(histogram)} boards, at most {len(histogram) - 1} moves from the goal\n")
+
+    #spread the hardest test board over more and more workers to measure scaling
+    print("HDA* Scaling:")
+    for row in hda_scaling(state_from_board(initial_boards[-1]), sorted({1, 2, os.cpu_count() or 1})):
+        print(f"{row['workers']} workers: {row['time']:.3f} seconds, speedup {row['speedup']:.2f}, "
+              f"efficiency {row['efficiency']:.2f}, search overhead {row['search_overhead']:.2f}")
+        for rank, worker in enumerate(row['per_worker']):
+            print(f"  worker {rank}: {worker['expanded']} expanded, {worker['share']:.2f} of an even share, "
+                  f"busy {worker['busy']:.0%} of the time")
+    print()
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Solve 8-puzzle boards. With no command, runs the benchmark.")
+    commands = parser.add_subparsers(dest="command")
+    solve_parser = commands.add_parser("solve", help="read one JSON board per line, write one JSON result per line")
+    solve_parser.add_argument("input", nargs="?", default="-", help="file of boards, - for stdin (default)")
+    solve_parser.add_argument("-a", "--algorithm", default="astar", choices=sorted(SOLVERS))
+    solve_parser.add_argument("-w", "--workers", type=int, default=1, help="number of processes (default 1)")
+    solve_parser.add_argument("-H", "--heuristic", help=f"for {', '.join(INFORMED_SOLVERS)}: one of {', '.join(HEURISTICS)} "
+                                                        "or max(...) of them (default manhattan, batch_astar "
+                                                        f"takes {', '.join(BATCH_HEURISTICS)})")
+    args = parser.parse_args(argv)
+
+    if args.command == "solve":
+        options = {}
+        if args.heuristic is not None:
+            #caught here rather than as a traceback from the first board
+            if args.algorithm not in INFORMED_SOLVERS:
+                solve_parser.error(f"--heuristic does not apply to {args.algorithm}, an uninformed search")
+            name = args.heuristic.replace(" ", "")
+            if args.algorithm == "batch_astar":
+                known = name in BATCH_HEURISTICS
+            else:
+                parts = name[4:-1].split(",") if name.startswith("max(") and name.endswith(")") else [name]
+                known = all(part in HEURISTICS for part in parts)
+            if not known:
+                solve_parser.error(f"unknown heuristic {args.heuristic!r} for {args.algorithm}")
+            options['heuristic_fn'] = args.heuristic
+        if args.input == "-":
+            solve_stream(sys.stdin, sys.stdout, args.algorithm, args.workers, **options)
+        else:
+            with open(args.input) as lines:
+                solve_stream(lines, sys.stdout, args.algorithm, args.workers, **options)
     else:
-        print(f"Failed to find solution in {MAX_ITERATION} iterations\n")
\ No newline at end of file
+        run_benchmark()
+
+if __name__ == "__main__":
+    main()
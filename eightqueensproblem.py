@@ -1,65 +1,114 @@
+from array import array
 import random
 import math
 import time
 
+# Shared Conflict Tracker
+#keeps how many queens are on every row, diagonal and anti-diagonal so the number of
+#attacking pairs is known at all times, and the change a move or swap would make is O(1)
+#board[column] is the row of the queen in that column, columns are always distinct
+class QueenBoard:
+    def __init__(self, board):
+        self.board = list(board)
+        self.n = n = len(self.board)
+        self.rows = [0] * n
+        #diagonal of (row, column) is row - column + n - 1, anti-diagonal is row + column
+        self.diagonals = [0] * (2 * n - 1)
+        self.anti_diagonals = [0] * (2 * n - 1)
+        for column, row in enumerate(self.board):
+            self.rows[row] += 1
+            self.diagonals[row - column + n - 1] += 1
+            self.anti_diagonals[row + column] += 1
+        #k queens on a line make k * (k - 1) / 2 attacking pairs
+        self.conflicts = sum(k * (k - 1) // 2 for lines in (self.rows, self.diagonals, self.anti_diagonals)
+                             for k in lines)
+
+    #change in conflicts if the queen in this column moved to row
+    def move_delta(self, column, row):
+        old = self.board[column]
+        if row == old:
+            return 0
+        n = self.n
+        #pairs the queen joins on its new lines minus the ones it leaves on its old lines
+        return (self.rows[row] + self.diagonals[row - column + n - 1] + self.anti_diagonals[row + column]
+                - self.rows[old] - self.diagonals[old - column + n - 1] - self.anti_diagonals[old + column] + 3)
+
+    #moves the queen in this column to row, updating the counters
+    def move(self, column, row):
+        delta = self.move_delta(column, row)
+        old = self.board[column]
+        n = self.n
+        self.rows[old] -= 1
+        self.diagonals[old - column + n - 1] -= 1
+        self.anti_diagonals[old + column] -= 1
+        self.rows[row] += 1
+        self.diagonals[row - column + n - 1] += 1
+        self.anti_diagonals[row + column] += 1
+        self.board[column] = row
+        self.conflicts += delta
+
+    #change in conflicts if the queens in columns i and j swapped rows: the first move is made
+    #and undone so the second is measured against the counters it would really see
+    def swap_delta(self, i, j):
+        row_i, row_j = self.board[i], self.board[j]
+        delta = self.move_delta(i, row_j)
+        self.move(i, row_j)
+        delta += self.move_delta(j, row_i)
+        self.move(i, row_i)
+        return delta
+
+    def swap(self, i, j):
+        row_i, row_j = self.board[i], self.board[j]
+        self.move(i, row_j)
+        self.move(j, row_i)
+
+#number of queens attacking each other, O(n)
+def conflicts(board):
+    return QueenBoard(board).conflicts
+
+#generates a random board where each queen is put into a random row in its column
+#means that columns are distinct, need to check for rows and diagonal only.
+def random_board(n):
+    board = list(range(n))
+    random.shuffle(board)
+    return board
+
 # Hill-Climb Algorithm
 def hill_climb(n):
-    #used to count the number of queens currently attacking each other on this board.
-    #O(n^2) time complexity
-    def conflicts(board):
-        count = 0
-        for i in range(n):
-            for j in range(i + 1, n):
-                #same row or same diagonal logic
-                if board[i] == board[j] or abs(board[i] - board[j]) == abs(i - j):
-                    count += 1
-        return count
-
-    #generates a random board where each queen is put into a random row in its column
-    #means that columns are distinct, need to check for rows and diagonal only.
-    def random_board(n):
-        board = list(range(n))
-        random.shuffle(board)
-        return board
-
     #start with a random state and check its conflicts
-    current = random_board(n)
-    current_conflicts = conflicts(current)
-    #loop generates all possible neighboring states
+    current = QueenBoard(random_board(n))
+    #loop scores all possible neighboring states in place, O(1) each
     #moves each queen in its column and looks for a better state
-    #better means less conflicts in next_board
+    #better means less conflicts than the current board
     while True:
-        neighbors = []
+        best_delta, best_move = None, None
         for i in range(n):
             for j in range(n):
-                if j != current[i]:
-                    neighbor = list(current)
-                    neighbor[i] = j
-                    neighbors.append(neighbor)
-        next_board = min(neighbors, key=conflicts)
-        next_conflicts = conflicts(next_board)
-        if next_conflicts >= current_conflicts:
+                if j != current.board[i]:
+                    delta = current.move_delta(i, j)
+                    if best_delta is None or delta < best_delta:
+                        best_delta, best_move = delta, (i, j)
+        if best_delta is None or best_delta >= 0:
+            break
+        current.move(*best_move)
+    return current.board, current.conflicts
+
+#hill climbing from new random boards until one gets to 0 conflicts, keeping the best board
+#seen if restarts runs out first
+def random_restart_hill_climb(n, restarts=None):
+    best_board, best_conflicts = None, None
+    attempt = 0
+    while restarts is None or attempt <= restarts:
+        board, conflicts = hill_climb(n)
+        if best_conflicts is None or conflicts < best_conflicts:
+            best_board, best_conflicts = board, conflicts
+        if conflicts == 0:
             break
-        current, current_conflicts = next_board, next_conflicts
-    return current, current_conflicts
+        attempt += 1
+    return best_board, best_conflicts
 
 # Simulated Annealing Algorithm
 def simulated_annealing(n):
-    #same conflicts function as before
-    def conflicts(board):
-        count = 0
-        for i in range(n):
-            for j in range(i + 1, n):
-                if board[i] == board[j] or abs(board[i] - board[j]) == abs(i - j):
-                    count += 1
-        return count
-
-    #same method to get a random board
-    def random_board(n):
-        board = list(range(n))
-        random.shuffle(board)
-        return board
-
     #allowed temperature decreases over time
     #t is current iteration
     #decays over time
@@ -71,44 +120,25 @@ def simulated_annealing(n):
         return math.exp(-delta_e / t)
 
     #start off with a random board and count its conflicts
-    current = random_board(n)
-    current_conflicts = conflicts(current)
+    current = QueenBoard(random_board(n))
     t = 1
     #MAIN LOOP
     while t < 10000:
-        #generating a neighboring solution
-        neighbor = list(current)
+        #pick a neighboring solution, swapping the rows of two queens
         i = random.randint(0, n - 1)
         j = random.randint(0, n - 1)
-        neighbor[i], neighbor[j] = neighbor[j], neighbor[i]  # Swap rows
-        #calculate the change in conflicts from current and neighbor state
-        neighbor_conflicts = conflicts(neighbor)
-        #calculate change in conflicts
-        delta_e = neighbor_conflicts - current_conflicts
+        #calculate the change in conflicts from current and neighbor state without building it
+        delta_e = current.swap_delta(i, j)
         #if the temperature is high enough, take the risk on the neighor with a worst cost.
         if delta_e < 0 or random.random() < probability(delta_e, temperature(t)):
-            current, current_conflicts = neighbor, neighbor_conflicts
+            current.swap(i, j)
         #increase the time which will  lower the temperature
         t += 1
-    return current, current_conflicts
+    return current.board, current.conflicts
 
 # Genetic Algorithm
 def genetic_algorithm(n, population_size=100, generations=1000, mutation_rate=0.01):
-    #counts the number of conflicts in the board
-    def conflicts(board):
-        count = 0
-        for i in range(n):
-            for j in range(i + 1, n):
-                if board[i] == board[j] or abs(board[i] - board[j]) == abs(i - j):
-                    count += 1
-        return count
-
-    #places a queen in a unique column.
-    def random_board(n):
-        board = list(range(n))
-        random.shuffle(board)
-        return board
-
+    #conflicts() scores a board in O(n) with the shared counters
     #combining two board states to make a new child board
     def crossover(parent1, parent2):
         n = len(parent1)
@@ -161,8 +191,409 @@ def genetic_algorithm(n, population_size=100, generations=1000, mutation_rate=0.
         population = new_population
     return population[0], conflicts(population[0])
 
+# Vectorised Genetic Algorithm
+#the same genetic algorithm with the whole population in one 2-D numpy array: fitness for every
+#board in one pass of bincounts, order crossover for every child at once with membership masks,
+#and the fitter half picked with argpartition instead of sorting
+#numpy is optional, only this solver imports it
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("genetic_algorithm_vectorised needs numpy (pip install numpy)") from None
+    return numpy
+
+#conflicts of every board (row) of a population, queens on a shared row or diagonal
+def population_conflicts(population):
+    np = _numpy()
+    size, n = population.shape
+    columns = np.arange(n)
+    total = np.zeros(size, dtype=np.int64)
+    #every board's lines get their own range of bins, so one bincount counts them all
+    for lines, width in ((population, n), (population - columns + n - 1, 2 * n - 1), (population + columns, 2 * n - 1)):
+        bins = lines + (np.arange(size) * width)[:, None]
+        counts = np.bincount(bins.ravel(), minlength=size * width).reshape(size, width)
+        total += (counts * (counts - 1) // 2).sum(axis=1)
+    return total
+
+def genetic_algorithm_vectorised(n, population_size=100, generations=1000, mutation_rate=0.01):
+    np = _numpy()
+    #crossover needs two different parents
+    if population_size < 2:
+        raise ValueError(f"population_size must be at least 2, not {population_size}")
+    #seeded from random so random.seed() makes runs repeatable like the other solvers
+    rng = np.random.default_rng(random.getrandbits(64))
+    population = random_population(n, population_size, rng)
+    for generation in range(generations):
+        fitness = population_conflicts(population)
+        #if the lowest conflicting state has 0 conflicts, it is the goal state
+        if fitness.min() == 0:
+            break
+        population = next_generation(population, fitness, rng, mutation_rate)
+    fitness = population_conflicts(population)
+    best = np.argmin(fitness)
+    return population[best].tolist(), int(fitness[best])
+
+#start with the population of boards, each a random permutation
+def random_population(n, population_size, rng):
+    np = _numpy()
+    return rng.permuted(np.tile(np.arange(n), (population_size, 1)), axis=1)
+
+#one generation: the fitter half survives and the best 50 boards breed the other half, like
+#genetic_algorithm() a population under 100 breeds from its best 50 and not just the survivors
+def next_generation(population, fitness, rng, mutation_rate):
+    np = _numpy()
+    population_size, n = population.shape
+    elite_size = population_size // 2
+    pool_size = min(50, population_size)
+    children = population_size - elite_size
+    elite = population[np.argpartition(fitness, elite_size - 1)[:elite_size]]
+    pool = population[np.argpartition(fitness, pool_size - 1)[:pool_size]]
+    first = rng.integers(pool_size, size=children)
+    second = (first + rng.integers(1, pool_size, size=children)) % pool_size
+    offspring = order_crossover(pool[first], pool[second], rng)
+    #swap two queens in a random mutation_rate of the children
+    mutants = np.flatnonzero(rng.random(children) < mutation_rate)
+    i = rng.integers(n, size=len(mutants))
+    j = (i + rng.integers(1, n, size=len(mutants))) % n
+    offspring[mutants, i], offspring[mutants, j] = offspring[mutants, j], offspring[mutants, i]
+    return np.concatenate([elite, offspring])
+
+#order crossover for a whole batch of parent pairs in O(n) each: every child copies a random
+#segment of its first parent and fills the other cells, left to right, with the values of its
+#second parent that are not in the segment, in the order they appear there
+def order_crossover(first, second, rng):
+    np = _numpy()
+    size, n = first.shape
+    rows = np.arange(size)[:, None]
+    #two distinct crossover points per child, the segment includes both
+    start = rng.integers(n, size=size)
+    end = (start + rng.integers(1, n, size=size)) % n
+    start, end = np.minimum(start, end), np.maximum(start, end)
+    columns = np.arange(n)
+    segment = (columns >= start[:, None]) & (columns <= end[:, None])
+    #membership mask by value: which values the segment already holds
+    member = np.zeros((size, n), dtype=bool)
+    member[rows, first] = segment
+    keep = ~member[rows, second]
+    child = np.where(segment, first, 0)
+    #each row has as many cells to fill as values kept, so row-major order lines them up
+    child[~segment] = second[keep]
+    return child
+
+# Island Model Genetic Algorithm
+#several populations evolve in their own processes and every few generations send copies of
+#their best boards to other islands through each island's inbox queue (a pipe underneath, fed
+#by a thread so sending never blocks), which keeps them from all converging on the same local
+#minimum. The first island to find a 0-conflict board tells every other one to stop
+def _island(index, n, population_size, generations, mutation_rate, migration_interval, migrants,
+            inboxes, topology, solved, results, seed):
+    from queue import Empty
+
+    np = _numpy()
+    #boards still queued for islands that have stopped reading must not hold up the exit,
+    #whether this island finishes or fails
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    rng = np.random.default_rng(seed)
+    islands = len(inboxes)
+    population = random_population(n, population_size, rng)
+    generation = 0
+    for generation in range(generations):
+        #another island has finished
+        if solved.is_set():
+            break
+        fitness = population_conflicts(population)
+        best = np.argmin(fitness)
+        if fitness[best] == 0:
+            solved.set()
+            break
+        if generation and generation % migration_interval == 0:
+            #send copies of the best boards on, ring: to the next island, random: to any other one
+            chosen = population[np.argpartition(fitness, migrants - 1)[:migrants]]
+            if topology == "ring" or islands == 1:
+                target = (index + 1) % islands
+            else:
+                target = (index + 1 + int(rng.integers(islands - 1))) % islands
+            if target != index:
+                inboxes[target].put(chosen)
+            #whatever has arrived replaces the worst boards
+            while True:
+                try:
+                    arrived = inboxes[index].get_nowait()
+                except Empty:
+                    break
+                worst = np.argpartition(-fitness, len(arrived) - 1)[:len(arrived)]
+                population[worst] = arrived
+                fitness[worst] = population_conflicts(arrived)
+        population = next_generation(population, fitness, rng, mutation_rate)
+    fitness = population_conflicts(population)
+    best = np.argmin(fitness)
+    results.put((index, generation, population[best].tolist(), int(fitness[best])))
+
+def island_model(n, islands=4, population_size=100, generations=1000, mutation_rate=0.01,
+                 migration_interval=10, migrants=5, topology="ring", report=None):
+    import multiprocessing
+    from queue import Empty
+
+    if topology not in ("ring", "random"):
+        raise ValueError(f"topology must be 'ring' or 'random', not {topology!r}")
+    if population_size < 2:
+        raise ValueError(f"population_size must be at least 2, not {population_size}")
+    if islands < 1 or migration_interval < 1:
+        raise ValueError("need at least 1 island and a migration_interval of at least 1 generation")
+    #the migrants replace the worst boards, so some of the population has to stay
+    if not 0 < migrants < population_size:
+        raise ValueError(f"migrants must be between 1 and population_size - 1 ({population_size - 1}), not {migrants}")
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(islands)]
+    solved = context.Event()
+    results = context.Queue()
+    start_time = time.time()
+    processes = []
+    for i in range(islands):
+        processes.append(context.Process(target=_island, daemon=True, args=(
+            i, n, population_size, generations, mutation_rate, migration_interval, migrants,
+            inboxes, topology, solved, results, random.getrandbits(64))))
+    for process in processes:
+        process.start()
+    #every island reports its best board, the winner first. An island that crashed never
+    #will, so between reports check that none has died
+    finished = []
+    try:
+        while len(finished) < islands:
+            try:
+                finished.append(results.get(timeout=0.1))
+            except Empty:
+                for i, process in enumerate(processes):
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(f"island {i} exited with code {process.exitcode}") from None
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        elapsed_time = time.time() - start_time
+        for process in processes:
+            process.join()
+    winner = min(finished, key=lambda result: result[3])
+    if report is not None:
+        report.update({
+            'islands': islands,
+            'topology': topology,
+            'winner': winner[0],
+            'generations': winner[1],
+            'time': elapsed_time,
+        })
+    return winner[2], winner[3]
+
+#time to solution of the island model against one population of the same size. Only runs that
+#found a 0-conflict board count towards the times, a run that used up its generations has no
+#time to solution, so how often that happens is in the success rates instead. The times and
+#the speedup are None when a side never solved the board
+def island_speedup(n, islands=4, runs=3, **options):
+    single_times, island_times = [], []
+    for _ in range(runs):
+        start_time = time.time()
+        board, conflicts = genetic_algorithm_vectorised(n)
+        if conflicts == 0:
+            single_times.append(time.time() - start_time)
+        start_time = time.time()
+        board, conflicts = island_model(n, islands, **options)
+        if conflicts == 0:
+            island_times.append(time.time() - start_time)
+    single_time = sum(single_times) / len(single_times) if single_times else None
+    island_time = sum(island_times) / len(island_times) if island_times else None
+    return {
+        'n': n,
+        'islands': islands,
+        'single_time': single_time,
+        'single_success_rate': len(single_times) / runs,
+        'island_time': island_time,
+        'island_success_rate': len(island_times) / runs,
+        'speedup': single_time / island_time if single_time and island_time else None,
+    }
+
+# Min-Conflicts Algorithm
+#local search that scales to millions of queens: the rows are kept a permutation so only
+#diagonals can conflict, the board and counters live in array('i') buffers, and every repair
+#step does O(1) work no matter how big n is
+def min_conflicts(n, max_steps=1000000, tries=32):
+    rand = random.random
+    size = 2 * n - 1
+    board = array('i', range(n))
+    #queens on every diagonal and anti-diagonal, and the xor of their columns: a line with
+    #one queen on it gives that queen's column without searching for it
+    diagonals = array('i', [0]) * size
+    anti_diagonals = array('i', [0]) * size
+    diagonal_columns = array('i', [0]) * size
+    anti_diagonal_columns = array('i', [0]) * size
+    #columns whose queen may be under attack, with lazy removal; listed[column] says if it is in
+    conflicted = []
+    listed = bytearray(n)
+
+    def mark(column):
+        if not listed[column]:
+            listed[column] = 1
+            conflicted.append(column)
+
+    def add(column, row):
+        #places the queen and returns how many pairs it now attacks
+        board[column] = row
+        d = row - column + n - 1
+        a = row + column
+        pairs = diagonals[d] + anti_diagonals[a]
+        if diagonals[d] == 1:
+            mark(diagonal_columns[d])
+        if anti_diagonals[a] == 1:
+            mark(anti_diagonal_columns[a])
+        if pairs:
+            mark(column)
+        diagonals[d] += 1
+        anti_diagonals[a] += 1
+        diagonal_columns[d] ^= column
+        anti_diagonal_columns[a] ^= column
+        return pairs
+
+    def remove(column):
+        #lifts the queen and returns how many pairs it was attacking
+        row = board[column]
+        d = row - column + n - 1
+        a = row + column
+        diagonals[d] -= 1
+        anti_diagonals[a] -= 1
+        diagonal_columns[d] ^= column
+        anti_diagonal_columns[a] ^= column
+        return diagonals[d] + anti_diagonals[a]
+
+    def swap(i, j):
+        #swaps the rows of two queens and returns the change in conflicts
+        row_i, row_j = board[i], board[j]
+        delta = -remove(i) - remove(j)
+        return delta + add(i, row_j) + add(j, row_i)
+
+    def attacked(column):
+        row = board[column]
+        return diagonals[row - column + n - 1] > 1 or anti_diagonals[row + column] > 1
+
+    def place():
+        #greedy placement, column by column: swap in a random row still left whose diagonals
+        #are both free, settling for the last one tried if none turns up
+        rows = list(range(n))
+        random.shuffle(rows)
+        board[:] = array('i', rows)
+        for line in (diagonals, anti_diagonals, diagonal_columns, anti_diagonal_columns):
+            line[:] = array('i', [0]) * size
+        del conflicted[:]
+        listed[:] = bytes(n)
+        total = 0
+        for i in range(n):
+            for _ in range(tries):
+                j = i + int(rand() * (n - i))
+                row = board[j]
+                if not diagonals[row - i + n - 1] and not anti_diagonals[row + i]:
+                    break
+            board[i], board[j] = board[j], board[i]
+            total += add(i, board[i])
+        return total
+
+    #repair: pick a conflicted queen and swap it with a random one whenever that does not hurt,
+    #starting over from a new placement when nothing has improved for a while
+    total = place()
+    steps = 0
+    stuck = 0
+    while total and steps < max_steps:
+        if stuck > n + 100:
+            total = place()
+            stuck = 0
+            continue
+        index = int(rand() * len(conflicted))
+        i = conflicted[index]
+        if not attacked(i):
+            listed[i] = 0
+            conflicted[index] = conflicted[-1]
+            conflicted.pop()
+            continue
+        j = int(rand() * n)
+        if i == j:
+            continue
+        steps += 1
+        stuck += 1
+        delta = swap(i, j)
+        if delta > 0:
+            #it made things worse, swap back
+            swap(i, j)
+        else:
+            total += delta
+            if delta:
+                stuck = 0
+    return board, total
+
+# Portfolio Runner
+#races several solvers in their own processes, each seeded differently, and keeps the first
+#0-conflict board: a worker whose run fails just starts another one, and once there is a
+#winner the others are terminated rather than left to finish
+def _portfolio_worker(index, algorithm, n, seed, results):
+    random.seed(seed)
+    attempts = 0
+    while True:
+        attempts += 1
+        board, conflicts = algorithm(n)
+        if conflicts == 0:
+            break
+    results.put((index, list(board), attempts))
+
+def portfolio(n, solvers=None, timeout=None, report=None):
+    import multiprocessing
+    from queue import Empty
+
+    #no board of 2 or 3 queens is free of conflicts, the workers would never stop
+    if n in (2, 3) or n < 1:
+        raise ValueError(f"there is no solution for {n} queens, n must be 1 or at least 4")
+    if solvers is None:
+        solvers = [random_restart_hill_climb, simulated_annealing, genetic_algorithm_vectorised]
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    seeds = [random.getrandbits(64) for _ in solvers]
+    start_time = time.time()
+    stop_time = None if timeout is None else start_time + timeout
+    processes = [context.Process(target=_portfolio_worker, daemon=True, args=(i, algorithm, n, seed, results))
+                 for i, (algorithm, seed) in enumerate(zip(solvers, seeds))]
+    for process in processes:
+        process.start()
+    #wait for a winner in short polls, so a solver that crashed is noticed instead of waited on
+    index, board, attempts = None, None, 0
+    try:
+        while stop_time is None or time.time() < stop_time:
+            wait = 0.1 if stop_time is None else max(0.0, min(0.1, stop_time - time.time()))
+            try:
+                index, board, attempts = results.get(timeout=wait)
+                break
+            except Empty:
+                for i, process in enumerate(processes):
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(f"{solvers[i].__name__} exited with code {process.exitcode}") from None
+    finally:
+        elapsed_time = time.time() - start_time
+        #cancel the losers straight away
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    if report is not None:
+        report.update({
+            'solvers': [algorithm.__name__ for algorithm in solvers],
+            'seeds': seeds,
+            'winner': solvers[index].__name__ if index is not None else None,
+            'attempts': attempts,
+            'time': elapsed_time,
+        })
+    if board is None:
+        return None, None
+    return board, 0
+
 # Performance Measurement
-def measure_performance(algorithm, n, runs=10):
+def measure_performance(algorithm, n, runs=10, show_boards=True):
     times = []
     successes = 0
     for _ in range(runs):
@@ -171,7 +602,9 @@ def measure_performance(algorithm, n, runs=10):
         elapsed_time = time.time() - start_time
         times.append(elapsed_time)
         print(f"V number of conflicts: {conflicts}")
-        print_board(board)
+        #a board of a million queens is not something to print
+        if show_boards:
+            print_board(board)
         if conflicts == 0:
             successes += 1
     return {
@@ -200,13 +633,13 @@ if __name__ == "__main__":
     n = 8
     runs = 10
 
-    algorithms = [hill_climb, simulated_annealing, genetic_algorithm]
+    algorithms = [hill_climb, simulated_annealing, genetic_algorithm, genetic_algorithm_vectorised, min_conflicts]
     results = []
 
     for algorithm in algorithms:
         result = measure_performance(algorithm, n, runs)
         results.append(result)
-        print(f"End Result: {result["end result"]}")
+        print(f"End Result: {result['end result']}")
         # print_board(result["end result"])
         print(f"Algorithm: {result['algorithm']}")
         print(f"Success Rate: {result['success_rate'] * 100}%")
@@ -218,4 +651,52 @@ if __name__ == "__main__":
     # Comparison Summary
     print("Comparison Summary:")
     for result in results:
-        print(result)
\ No newline at end of file
+        print(result)
+    print()
+
+    # Genetic Algorithm Throughput
+    #fixed generations on boards too big to be solved that quickly
+    print("Genetic Algorithm Generations per Second:")
+    for n in [64, 256]:
+        for algorithm in [genetic_algorithm, genetic_algorithm_vectorised]:
+            start_time = time.time()
+            algorithm(n, generations=20)
+            elapsed_time = time.time() - start_time
+            print(f"n = {n} {algorithm.__name__}: {20 / elapsed_time:.1f}")
+    print()
+
+    # Island Model Speedup
+    #time to solution counts solved runs only, a side that never solved has none
+    def seconds(value):
+        return "no solution" if value is None else f"{value:.3f} seconds"
+
+    print("Island Model Genetic Algorithm:")
+    for topology in ["ring", "random"]:
+        result = island_speedup(16, islands=4, runs=5, topology=topology)
+        speedup = "n/a" if result['speedup'] is None else f"{result['speedup']:.2f}"
+        print(f"n = 16, 4 islands, {topology}: {seconds(result['island_time'])} to solution "
+              f"({result['island_success_rate'] * 100:.0f}% solved) against {seconds(result['single_time'])} "
+              f"({result['single_success_rate'] * 100:.0f}% solved) for one population, speedup {speedup}")
+    print()
+
+    # Portfolio Runner
+    #who wins changes with n and with luck, so race them a few times
+    print("Portfolio Runner:")
+    for n in [8, 16, 32]:
+        wins = {}
+        times = []
+        for _ in range(5):
+            report = {}
+            portfolio(n, report=report)
+            wins[report['winner']] = wins.get(report['winner'], 0) + 1
+            times.append(report['time'])
+        print(f"n = {n}: average {sum(times) / len(times):.3f} seconds, wins {wins}")
+    print()
+
+    # Min-Conflicts Scaling
+    #time per queen should stay about flat as n grows by 10x each time
+    print("Min-Conflicts Scaling:")
+    for n in [1000, 10000, 100000, 1000000]:
+        result = measure_performance(min_conflicts, n, runs=1, show_boards=False)
+        print(f"n = {n}: {result['average_time']:.3f} seconds, "
+              f"{result['average_time'] / n * 1e6:.2f} microseconds per queen")
\ No newline at end of file
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+import eightpuzzleproblem as puzzle
+
+#heuristics that only misbehave inside the HDA* workers, the coordinator evaluates the start board itself
+PARENT = os.getpid()
+
+def failing_heuristic(state):
+    if os.getpid() != PARENT:
+        raise KeyError("failing heuristic")
+    return state.h
+
+def exiting_heuristic(state):
+    if os.getpid() != PARENT:
+        os._exit(3)
+    return state.h
+
+
+class HdaAstarTest(unittest.TestCase):
+    def test_matches_astar(self):
+        for board in puzzle.initial_boards[5:]:
+            state = puzzle.state_from_board(board)
+            expected, _ = puzzle.astar(state)
+            for workers in (1, 2, 3):
+                report = {}
+                path, expanded = puzzle.hda_astar(state, workers=workers, batch_size=8, report=report)
+                if expected is None:
+                    self.assertIsNone(path)
+                    continue
+                self.assertEqual(len(path), len(expected))
+                self.assertTrue(path[-1].is_goal())
+                self.assertEqual(expanded, sum(worker['expanded'] for worker in report['per_worker']))
+
+    def test_unsolvable(self):
+        state = puzzle.state_from_board([[1, 2, 3], [4, 5, 6], [8, 7, 0]])
+        self.assertEqual(puzzle.hda_astar(state, workers=2), (None, 0))
+
+    def test_worker_exception(self):
+        state = puzzle.state_from_board(puzzle.initial_boards[-1])
+        with self.assertRaisesRegex(RuntimeError, "failing heuristic"):
+            puzzle.hda_astar(state, workers=2, heuristic_fn=failing_heuristic)
+
+    def test_worker_death(self):
+        state = puzzle.state_from_board(puzzle.initial_boards[-1])
+        with self.assertRaisesRegex(RuntimeError, "exit code 3"):
+            puzzle.hda_astar(state, workers=2, heuristic_fn=exiting_heuristic)
+
+
+class PatternDatabaseTest(unittest.TestCase):
+    def test_custom_split(self):
+        patterns = ((1, 2, 3), (4, 5, 6, 7, 8))
+        self.assertNotEqual(puzzle.pattern_database_path(3, patterns), puzzle.pattern_database_path(3))
+        self.assertEqual(puzzle.pattern_database_path(3, puzzle.DEFAULT_PATTERNS[3]), puzzle.pattern_database_path(3))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pdb.bin")
+            database = puzzle.pattern_database(3, patterns=patterns, path=path)
+            self.assertEqual(database.patterns, list(patterns))
+            self.assertEqual(database.buffer[database.offsets[0]:], b"".join(puzzle.build_pattern_database(3, patterns)))
+            for board in puzzle.initial_boards:
+                state = puzzle.state_from_board(board)
+                path_found, _ = puzzle.astar(state)
+                if path_found is not None:
+                    self.assertLessEqual(database(state), len(path_found) - 1)
+            database.close()
+            #the same file must not be handed out for another split
+            with self.assertRaises(ValueError):
+                puzzle.pattern_database(3, path=path)
+
+
+class SolutionCacheTest(unittest.TestCase):
+    def test_second_search_hits(self):
+        cache = puzzle.SolutionCache()
+        state = puzzle.state_from_board(puzzle.initial_boards[-1])
+        first, _ = puzzle.astar(state, cache=cache)
+        second, iterations = puzzle.astar(state, cache=cache)
+        self.assertEqual(len(second), len(first))
+        self.assertTrue(second[-1].is_goal())
+        self.assertEqual(iterations, 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_save_and_load(self):
+        cache = puzzle.SolutionCache()
+        puzzle.astar(puzzle.state_from_board(puzzle.initial_boards[-1]), cache=cache)
+        with self.assertRaises(ValueError):
+            cache.save()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.json")
+            cache.save(path)
+            self.assertEqual(os.listdir(directory), ["cache.json"])
+            self.assertEqual(puzzle.SolutionCache(path=path).entries, cache.entries)
+            #loading into a smaller cache keeps the most recently used boards
+            small = puzzle.SolutionCache(capacity=5, path=path)
+            self.assertEqual(list(small.entries.items()), list(cache.entries.items())[-5:])
+
+
+if __name__ == "__main__":
+    unittest.main()
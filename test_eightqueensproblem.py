@@ -0,0 +1,88 @@
+import multiprocessing
+import unittest
+
+import eightqueensproblem as queens
+
+def slow_conflicts(board):
+    n = len(board)
+    return sum(1 for i in range(n) for j in range(i + 1, n)
+               if board[i] == board[j] or abs(board[i] - board[j]) == j - i)
+
+def failing_generation(*args):
+    raise KeyError("failing generation")
+
+def failing_solver(n):
+    raise KeyError("failing solver")
+
+def stuck_solver(n):
+    return list(range(n)), 1
+
+
+class VectorisedGeneticAlgorithmTest(unittest.TestCase):
+    def test_small_populations(self):
+        for population_size in (2, 3, 4, 5):
+            board, conflicts = queens.genetic_algorithm_vectorised(8, population_size=population_size, generations=50)
+            self.assertEqual(sorted(board), list(range(8)))
+            self.assertEqual(conflicts, slow_conflicts(board))
+
+    def test_rejects_single_board_population(self):
+        with self.assertRaises(ValueError):
+            queens.genetic_algorithm_vectorised(8, population_size=1)
+
+
+class IslandModelTest(unittest.TestCase):
+    def test_reports_true_conflicts(self):
+        for topology in ("ring", "random"):
+            for islands in (1, 3):
+                report = {}
+                board, conflicts = queens.island_model(12, islands, generations=200, topology=topology, report=report)
+                self.assertEqual(sorted(board), list(range(12)))
+                self.assertEqual(conflicts, slow_conflicts(board))
+                self.assertEqual(report['islands'], islands)
+
+    def test_rejects_bad_migration(self):
+        with self.assertRaises(ValueError):
+            queens.island_model(8, 2, population_size=4, migrants=5)
+        with self.assertRaises(ValueError):
+            queens.island_model(8, 2, migrants=0)
+        with self.assertRaises(ValueError):
+            queens.island_model(8, 2, topology="star")
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork", "the islands must inherit the patched function")
+    def test_island_crash(self):
+        original = queens.next_generation
+        queens.next_generation = failing_generation
+        try:
+            #big enough that no starting board is already a solution, so next_generation() is reached
+            with self.assertRaisesRegex(RuntimeError, "exited with code"):
+                queens.island_model(30, 2)
+        finally:
+            queens.next_generation = original
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+class PortfolioTest(unittest.TestCase):
+    def test_reports_winner(self):
+        report = {}
+        board, conflicts = queens.portfolio(12, report=report)
+        self.assertEqual(sorted(board), list(range(12)))
+        self.assertEqual(conflicts, 0)
+        self.assertEqual(slow_conflicts(board), 0)
+        self.assertIn(report['winner'], report['solvers'])
+        self.assertGreaterEqual(report['attempts'], 1)
+        self.assertGreater(report['time'], 0)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_rejects_unsolvable_sizes(self):
+        for n in (2, 3):
+            with self.assertRaises(ValueError):
+                queens.portfolio(n)
+
+    def test_solver_crash(self):
+        with self.assertRaisesRegex(RuntimeError, "failing_solver exited with code"):
+            queens.portfolio(8, solvers=[stuck_solver, failing_solver])
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()